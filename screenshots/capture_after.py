@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Capture after screenshots of the redesigned UI."""
 
-from playwright.sync_api import sync_playwright
+import asyncio
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 
 BASE_URL = "http://localhost:8501"
+VIEWPORT = {"width": 1440, "height": 900}
+NETWORK_IDLE_TIMEOUT_MS = 3000
 
 PAGES = [
     ("/", "after-dashboard.png"),
@@ -12,21 +17,35 @@ PAGES = [
 ]
 
 
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page(viewport={"width": 1440, "height": 900})
+async def capture(browser, path: str, filename: str) -> None:
+    """Capture a single page in its own browser context."""
+    url = f"{BASE_URL}{path}"
+    print(f"Capturing {url} -> screenshots/{filename}")
+
+    context = await browser.new_context(viewport=VIEWPORT)
+    page = await context.new_page()
+    await page.goto(url, wait_until="domcontentloaded")
+    try:
+        # Cap the idle wait so a polling page can't stall the capture
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass
+    # Web fonts finish after network idle; wait for them instead of sleeping
+    await page.wait_for_function("document.fonts.status === 'loaded'")
+    await page.screenshot(path=f"screenshots/{filename}", full_page=True)
+    await context.close()
+
+
+async def main():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
 
-        for path, filename in PAGES:
-            url = f"{BASE_URL}{path}"
-            print(f"Capturing {url} -> screenshots/{filename}")
-            page.goto(url, wait_until="networkidle")
-            page.wait_for_timeout(1000)
-            page.screenshot(path=f"screenshots/{filename}", full_page=True)
+        # Pages load concurrently - total time is the slowest page, not the sum
+        await asyncio.gather(*(capture(browser, path, filename) for path, filename in PAGES))
 
-        browser.close()
+        await browser.close()
         print("Done!")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -2,100 +2,319 @@
 """Reddit Intelligence Agent - Autonomous scraping and analysis pipeline."""
 
 import argparse
+import hashlib
 import json
+import logging
+import socket
 import subprocess
 import sys
+import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Paths
+SRC_DIR = Path(__file__).resolve().parent
+BASE_DIR = SRC_DIR.parent
+
 # Add parent dir to path for imports when run directly
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(SRC_DIR))
 
-from scraper import scrape_focus_area, save_scrape_data, load_config, get_available_subreddits
-from analyzer import analyze_scrape_data, save_report
+import jsonio
+from config import load_config
 
+logger = logging.getLogger("reddar.agent")
 
-def run_pipeline(focus_area: str, verbose: bool = True) -> dict:
-    """Run the full scrape -> analyze pipeline."""
+# scraper/analyzer (and httpx with them) are imported inside the functions
+# that need them, so --list and --web-only start quickly
 
-    config = load_config()
+BATCH_SIZE = 50
+MAX_ANALYSIS_WORKERS = 4
+
+# With --cached, pipeline results are reused for repeat runs within the same hour
+PIPELINE_CACHE_DIR = BASE_DIR / "data" / "pipeline_cache"
+
+
+def get_pipeline_cache_path(focus_area: str, config: dict) -> Path:
+    """Get the cache file for a focus area's current hour bucket."""
+    focus_config = config.get("focus_areas", {}).get(focus_area, {})
+    key_data = {
+        "focus_area": focus_area,
+        "subreddits": sorted(focus_config.get("subreddits", [])),
+        "bucket": int(time.time() // 3600),
+    }
+    key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+    return PIPELINE_CACHE_DIR / f"{key}.json"
+
+
+def prune_pipeline_cache() -> None:
+    """Delete cached results from earlier hour buckets; they can never be hit again."""
+    bucket_start = time.time() // 3600 * 3600
+    try:
+        paths = list(PIPELINE_CACHE_DIR.glob("*.json"))
+    except FileNotFoundError:
+        return
+    for path in paths:
+        try:
+            if path.stat().st_mtime < bucket_start:
+                path.unlink()
+        except FileNotFoundError:
+            pass  # Pruned by another run
+
+
+def scrape_and_analyze(
+    focus_area: str, config: dict, skip_analyzed: bool = True
+) -> tuple[dict, dict]:
+    """Scrape and analyze concurrently, sending each batch to the LLM as soon as it fills.
+
+    Returns (scrape_data, report) tuple.
+    """
+    from scraper import ScrapeFileWriter, build_scrape_data, scrape_focus_area_iter
+    from analyzer import (
+        analyze_batch_with_split,
+        build_report,
+        filter_analyzed_posts,
+        flush_usage,
+        get_endpoint_configs,
+        merge_batch_analyses,
+        record_analyzed_posts,
+    )
 
-    if verbose:
-        print(f"\n{'=' * 60}")
-        print(f"Reddit Intelligence Agent")
-        print(f"Focus Area: {focus_area}")
-        print(f"Started: {datetime.now().isoformat()}")
-        print(f"{'=' * 60}\n")
+    focus_config = config["focus_areas"].get(focus_area)
+    if not focus_config:
+        raise ValueError(f"Unknown focus area: {focus_area}")
+
+    batch_size = config.get("llm", {}).get("batch_size", BATCH_SIZE)
+    posts_per_sub = config.get("scraper", {}).get("posts_per_subreddit", 25)
+    expected_posts = len(focus_config["subreddits"]) * posts_per_sub
+    expected_batches = max(1, (expected_posts + batch_size - 1) // batch_size)
+
+    scrape_data = build_scrape_data(focus_area, focus_config, [])
+    pending = []
+    # Only posts whose batch (or split half) parsed are remembered as analyzed
+    analyzed = []
+    cached_posts = 0
+    futures = []
+
+    # Batches go round-robin across endpoints, each allowed max_concurrency workers
+    endpoints = get_endpoint_configs(config)
+    max_workers = config.get("llm", {}).get("max_concurrency", MAX_ANALYSIS_WORKERS)
+    with ThreadPoolExecutor(
+        max_workers=max(1, max_workers) * len(endpoints)
+    ) as executor, ScrapeFileWriter(scrape_data) as writer:
+
+        def submit(batch):
+            batch_num = len(futures) + 1
+            total_batches = max(batch_num, expected_batches)
+            endpoint = endpoints[(batch_num - 1) % len(endpoints)]
+            futures.append(
+                executor.submit(
+                    analyze_batch_with_split,
+                    batch,
+                    scrape_data,
+                    endpoint,
+                    batch_num,
+                    total_batches,
+                    analyzed,
+                )
+            )
+
+        for _, posts in scrape_focus_area_iter(focus_area, config):
+            scrape_data["posts"].extend(posts)
+            # Written as each subreddit lands, overlapping with the LLM calls
+            writer.write_posts(posts)
+            if skip_analyzed:
+                posts, skipped = filter_analyzed_posts(posts, focus_area)
+                cached_posts += skipped
+            pending.extend(posts)
+            while len(pending) >= batch_size:
+                submit(pending[:batch_size])
+                pending = pending[batch_size:]
+
+        if pending:
+            submit(pending)
+
+        # Save while the last batches are still with the LLM
+        scrape_data["total_posts"] = len(scrape_data["posts"])
+        scrape_data["source_file"] = str(writer.close())
+
+        results = [future.result() for future in futures]
+
+    if not results:
+        # Nothing new - earlier findings are already in the merged report
+        analysis = {}
+    elif len(results) == 1:
+        analysis = results[0]
+    else:
+        batch_analyses = [r for r in results if "error" not in r]
+        for i, r in enumerate(results, 1):
+            if "error" in r:
+                logger.warning(f"  Batch {i} had error: {r.get('error')}")
+        if batch_analyses:
+            logger.info(f"Merging {len(batch_analyses)} batch results...")
+            analysis = merge_batch_analyses(batch_analyses, scrape_data["mode"])
+        else:
+            analysis = {"error": "All batches failed", "opportunities": [], "pain_points": []}
+
+    if analyzed:
+        record_analyzed_posts(analyzed, focus_area)
+    flush_usage()
+
+    failed_posts = len(scrape_data["posts"]) - cached_posts - len(analyzed)
+    report = build_report(scrape_data, analysis, config, len(results), cached_posts, failed_posts)
+    return scrape_data, report
+
+
+def run_pipeline(
+    focus_area: str,
+    use_cache: bool = False,
+    sequential: bool = False,
+    skip_analyzed: bool = True,
+) -> dict:
+    """Run the full scrape -> analyze pipeline.
+
+    use_cache reuses (and saves) this hour's result for the focus area
+    instead of scraping again. skip_analyzed leaves out posts analyzed in
+    earlier scans.
+    """
+    from scraper import scrape_focus_area, save_scrape_data
+    from analyzer import analyze_scrape_data, save_report
+
+    config = load_config()
+    started_at = datetime.now(timezone.utc).isoformat()
+
+    cache_path = get_pipeline_cache_path(focus_area, config)
+    if use_cache and cache_path.exists():
+        result = jsonio.load_file(cache_path)
+        logger.info(f"Using cached results for {focus_area} (run without --cached to refresh)")
+        logger.info(f"Full report: {result['report_file']}")
+        return result
+
+    logger.info(
+        "\n".join(
+            [
+                f"\n{'=' * 60}",
+                "Reddit Intelligence Agent",
+                f"Focus Area: {focus_area}",
+                f"Started: {started_at}",
+                f"{'=' * 60}\n",
+            ]
+        )
+    )
 
-    # Step 1: Scrape
-    if verbose:
-        print("[1/3] Scraping Reddit...")
+    if sequential:
+        # Step 1: Scrape
+        logger.info("[1/3] Scraping Reddit...")
 
-    scrape_data = scrape_focus_area(focus_area, config)
-    scrape_path = save_scrape_data(scrape_data)
-    scrape_data["source_file"] = str(scrape_path)
+        scrape_data = scrape_focus_area(focus_area, config)
+        scrape_file = str(save_scrape_data(scrape_data))
+        scrape_data["source_file"] = scrape_file
 
-    if verbose:
-        print(
+        logger.info(
             f"      Scraped {scrape_data['total_posts']} posts from {len(scrape_data['subreddits'])} subreddits"
         )
 
-    # Step 2: Analyze
-    if verbose:
-        print("\n[2/3] Analyzing with LLM...")
+        # Step 2: Analyze
+        logger.info("\n[2/3] Analyzing with LLM...")
+
+        report = analyze_scrape_data(scrape_data, config, skip_analyzed=skip_analyzed)
+    else:
+        # Steps 1+2: Scrape and analyze batches as they fill
+        logger.info("[1/3] Scraping Reddit...")
+        logger.info("[2/3] Analyzing with LLM as batches fill...")
 
-    report = analyze_scrape_data(scrape_data, config)
-    report_path, new_opps, new_pains = save_report(report)
+        scrape_data, report = scrape_and_analyze(focus_area, config, skip_analyzed=skip_analyzed)
+        scrape_file = scrape_data["source_file"]
 
-    if verbose:
-        analysis = report.get("analysis", {})
-        total_opps = len(analysis.get("opportunities", []))
-        total_pains = len(analysis.get("pain_points", []))
-        print(
-            f"      Found {new_opps} new opportunities (+{total_opps} total), {new_pains} new pain points (+{total_pains} total)"
+        logger.info(
+            f"      Scraped {scrape_data['total_posts']} posts from {len(scrape_data['subreddits'])} subreddits"
         )
 
+    report["metadata"]["pipeline_started_at"] = started_at
+    _, report_path, new_opps, new_pains = save_report(report)
+    report_file = str(report_path)
+
+    analysis = report.get("analysis") or {}
+    opportunities = analysis.get("opportunities") or []
+    total_opps = len(opportunities)
+
+    total_pains = len(analysis.get("pain_points") or [])
+    lines = [
+        f"      Found {new_opps} new opportunities (+{total_opps} total), {new_pains} new pain points (+{total_pains} total)"
+    ]
+    cached_posts = report.get("metadata", {}).get("cached_posts", 0)
+    if scrape_data["total_posts"]:
+        hit_rate = cached_posts / scrape_data["total_posts"] * 100
+        lines.append(f"      Skipped {cached_posts} already-analyzed posts ({hit_rate:.0f}% cache hit rate)")
+
     # Step 3: Summary
-    if verbose:
-        print("\n[3/3] Pipeline complete!")
-        print(f"\n{'=' * 60}")
-        print("Results Summary:")
-        print(f"{'=' * 60}")
-
-        if "analysis" in report and "executive_summary" in report["analysis"]:
-            print(f"\n{report['analysis']['executive_summary']}\n")
-
-        if "analysis" in report and "opportunities" in report["analysis"]:
-            print("Top Opportunities:")
-            for i, opp in enumerate(report["analysis"]["opportunities"][:5], 1):
-                print(
-                    f"  {i}. {opp.get('title', 'Untitled')} [{opp.get('potential', '?')} potential]"
-                )
+    lines += [
+        "\n[3/3] Pipeline complete!",
+        f"\n{'=' * 60}",
+        "Results Summary:",
+        f"{'=' * 60}",
+    ]
+
+    if "executive_summary" in analysis:
+        lines.append(f"\n{analysis['executive_summary']}\n")
+
+    if "opportunities" in analysis:
+        lines.append("Top Opportunities:")
+        lines.extend(
+            f"  {i}. {opp.get('title', 'Untitled')} [{opp.get('potential', '?')} potential]"
+            for i, opp in enumerate(opportunities[:5], 1)
+        )
 
-        print(f"\nFull report: {report_path}")
+    lines.append(f"\nFull report: {report_file}")
+    logger.info("\n".join(lines))
 
-    return {
+    result = {
         "success": True,
-        "scrape_file": str(scrape_path),
-        "report_file": str(report_path),
+        "scrape_file": scrape_file,
+        "report_file": report_file,
         "posts_analyzed": scrape_data["total_posts"],
         "opportunities_found": new_opps,
-        "total_opportunities": len(report.get("analysis", {}).get("opportunities", [])),
+        "total_opportunities": total_opps,
         "report": report,
+        "timestamp": started_at,
     }
 
+    # A degraded run shouldn't be replayed as a success for the rest of the hour
+    degraded = "error" in analysis or report.get("metadata", {}).get("failed_posts", 0)
+    if use_cache and not degraded:
+        PIPELINE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        prune_pipeline_cache()
+        jsonio.dump_file(result, cache_path, indent=False)
+
+    return result
+
 
 def list_focus_areas():
     """List available focus areas."""
-    areas = get_available_subreddits()
-    print("\nAvailable Focus Areas:")
-    print("-" * 40)
+    # Read straight from config so listing never imports the scraper
+    areas = load_config()["focus_areas"]
+    lines = ["\nAvailable Focus Areas:", "-" * 40]
     for area_id, info in areas.items():
-        print(f"\n{area_id}:")
-        print(f"  Name: {info['name']}")
-        print(f"  Description: {info['description']}")
-        print(f"  Subreddits: {', '.join(info['subreddits'])}")
+        lines += [
+            f"\n{area_id}:",
+            f"  Name: {info['name']}",
+            f"  Description: {info['description']}",
+            f"  Subreddits: {', '.join(info['subreddits'])}",
+        ]
+    print("\n".join(lines))
+
+
+def wait_for_port(port: int, timeout: float = 5.0) -> bool:
+    """Poll until something is listening on localhost:port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.05).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
 
 
 def start_dashboard(open_browser: bool = True):
@@ -104,20 +323,28 @@ def start_dashboard(open_browser: bool = True):
     web_config = config.get("web", {})
     port = web_config.get("port", 8501)
 
-    base_dir = Path(__file__).parent.parent
-    web_app = base_dir / "web" / "app.py"
+    web_app = BASE_DIR / "web" / "app.py"
 
     print(f"\nStarting dashboard on http://localhost:{port}")
 
+    proc = subprocess.Popen([sys.executable, str(web_app)], cwd=str(BASE_DIR))
+
+    # Only open the browser once the server is accepting connections
     if open_browser:
-        # Open browser after a short delay
-        webbrowser.open(f"http://localhost:{port}")
+        if wait_for_port(port):
+            webbrowser.open(f"http://localhost:{port}")
+        else:
+            print(f"Dashboard not reachable yet - open http://localhost:{port} manually")
 
-    # Run Flask in foreground (blocking)
-    subprocess.run([sys.executable, str(web_app)], cwd=str(base_dir))
+    try:
+        proc.wait()
+    except KeyboardInterrupt:
+        proc.terminate()
+        proc.wait()
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Build the agent's command-line parser."""
     parser = argparse.ArgumentParser(
         description="Reddit Intelligence Agent - Autonomous opportunity discovery"
     )
@@ -134,15 +361,48 @@ def main():
         "--no-web", action="store_true", help="Don't start web dashboard after analysis"
     )
     parser.add_argument("--web-only", action="store_true", help="Just start the web dashboard")
+    parser.add_argument(
+        "--open-browser",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Open the dashboard in a browser once it is ready",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Finish scraping before starting LLM analysis",
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="Reuse this hour's results for the focus area instead of scraping again",
+    )
+    parser.add_argument(
+        "--reanalyze",
+        action="store_true",
+        help="Re-analyze posts already analyzed in earlier scans",
+    )
+    return parser
+
+
+PARSER = build_parser()
 
-    args = parser.parse_args()
+
+def main():
+    args = PARSER.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout,
+    )
 
     if args.list:
         list_focus_areas()
         return
 
     if args.web_only:
-        start_dashboard()
+        start_dashboard(open_browser=args.open_browser)
         return
 
     # Get focus area
@@ -153,7 +413,12 @@ def main():
 
     # Run pipeline
     try:
-        result = run_pipeline(focus_area, verbose=not args.quiet)
+        result = run_pipeline(
+            focus_area,
+            use_cache=args.cached,
+            sequential=args.sequential,
+            skip_analyzed=not args.reanalyze,
+        )
 
         if args.json:
             # Output just the essential info as JSON
@@ -163,18 +428,18 @@ def main():
                 "posts_analyzed": result["posts_analyzed"],
                 "opportunities_found": result["opportunities_found"],
                 "report_file": result["report_file"],
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": result.get("timestamp"),
             }
-            print(json.dumps(output, indent=2))
+            print(jsonio.dumps(output))
 
         # Start web dashboard unless --no-web or --json
         if not args.no_web and not args.json:
-            start_dashboard()
+            start_dashboard(open_browser=args.open_browser)
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         if args.json:
-            print(json.dumps({"success": False, "error": str(e)}))
+            print(jsonio.dumps({"success": False, "error": str(e)}))
         sys.exit(1)
 
 
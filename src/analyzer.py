@@ -1,11 +1,27 @@
 """LLM-powered analyzer - Supports Ollama, SGLang, vLLM, and OpenAI-compatible endpoints."""
 
+import asyncio
+import atexit
+import gzip
+import hashlib
 import json
+import logging
+import os
+import re
+import string
+import sys
+import threading
+import time
 import httpx
-from datetime import datetime, timezone
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
-import yaml
+
+import jsonio
+from config import load_config
+
+logger = logging.getLogger("reddar.analyzer")
 
 # Provider presets for common LLM backends
 PROVIDER_PRESETS = {
@@ -31,12 +47,64 @@ PROVIDER_PRESETS = {
     },
 }
 
+# Posts already analyzed for a focus area are skipped for this long
+ANALYZED_POSTS_FILE = Path(__file__).parent.parent / "data" / "analyzed_posts.json"
+ANALYZED_POST_TTL_DAYS = 7
+
+# Concurrent LLM requests when analyzing multiple batches
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Usage is appended to a JSONL log in batches; usage.json holds totals and recent requests
+USAGE_FILE = Path(__file__).parent.parent / "data" / "usage.json"
+USAGE_LOG_FILE = Path(__file__).parent.parent / "data" / "usage.jsonl"
+# Past this size the log is rolled into data/usage.YYYYMM.jsonl.gz
+USAGE_LOG_MAX_BYTES = 10 * 1024 * 1024
+# Just the totals, for callers that don't need the recent requests
+USAGE_TOTALS_FILE = Path(__file__).parent.parent / "data" / "usage_totals.json"
+USAGE_PAYLOADS_DIR = Path(__file__).parent.parent / "data" / "usage_payloads"
+USAGE_FLUSH_SIZE = 50
+USAGE_FLUSH_INTERVAL = 5.0
+USAGE_RECENT_REQUESTS = 100
+_pending_usage: list[dict] = []
+_last_usage_flush = time.monotonic()
+# [file key, recent requests deque, totals] as last written by this process
+_usage_rollup: list = [None, None, None]
+_usage_lock = threading.Lock()
+
+# Keep-alive connections reused across LLM calls
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+JSON_DECODER = json.JSONDecoder()
+
+# OpenAI-style /batches jobs (llm.use_batch_api) are polled until done or timed out
+BATCH_API_POLL_INTERVAL = 5
+BATCH_API_TIMEOUT = 3600
+
+# Share of words two items must have in common to be merged as duplicates
+DUPLICATE_WORD_OVERLAP = 0.7
+WORD_PATTERN = re.compile(r"\w+")
+
+# Per-post truncation when formatting posts for the prompt
+MAX_POST_TEXT_CHARS = 1500
+MAX_COMMENTS_PER_POST = 5
+MAX_COMMENT_CHARS = 300
+
+# List fields of an analysis, with the key each item is deduplicated on
+ANALYSIS_ITEM_FIELDS = {
+    "opportunities": "title",
+    "pain_points": "problem",
+    "market_insights": "insight",
+    "top_stories": "headline",
+    "notable_releases": "name",
+    "trending_discussions": "topic",
+    "tools_mentioned": "name",
+}
+ANALYSIS_STRING_FIELDS = ("trending_topics", "recommended_actions", "key_takeaways")
 
-def load_config() -> dict:
-    """Load configuration from config.yaml."""
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+# Malformed batch responses are split in half and retried down to this size
+MIN_SPLIT_SIZE = 10
 
 
 def log_usage(
@@ -47,63 +115,167 @@ def log_usage(
     response_content: str = None,
     reasoning_content: str = None,
 ) -> None:
-    """Log token usage to a JSON file for dashboard display."""
+    """Queue token usage for the dashboard; flushed in batches by flush_usage."""
     import uuid
 
-    usage_file = Path(__file__).parent.parent / "data" / "usage.json"
-    usage_file.parent.mkdir(parents=True, exist_ok=True)
-
-    # Load existing usage data
-    if usage_file.exists():
-        with open(usage_file) as f:
-            data = json.load(f)
-    else:
-        data = {
-            "requests": [],
-            "totals": {
-                "requests": 0,
-                "prompt_tokens": 0,
-                "completion_tokens": 0,
-                "total_tokens": 0,
-            },
-        }
-
-    # Generate unique ID for this request
-    request_id = str(uuid.uuid4())[:8]
-
-    # Add new request with full content
     request_log = {
-        "id": request_id,
+        "id": str(uuid.uuid4())[:8],
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "model": model,
         "prompt_tokens": usage.get("prompt_tokens", 0),
         "completion_tokens": usage.get("completion_tokens", 0),
         "total_tokens": usage.get("total_tokens", 0),
         "latency_ms": latency_ms,
-        "messages": messages or [],
-        "response": response_content or "",
-        "reasoning": reasoning_content or "",
+        "prompt_chars": sum(len(m.get("content") or "") for m in messages or []),
+        # Spilled to a payload file on flush so usage.json stays small
+        "payload": {
+            "messages": messages or [],
+            "response": response_content or "",
+            "reasoning": reasoning_content or "",
+        },
     }
 
-    # Keep last 100 requests
-    data["requests"] = [request_log] + data["requests"][:99]
+    with _usage_lock:
+        _pending_usage.append(request_log)
+        due = (
+            len(_pending_usage) >= USAGE_FLUSH_SIZE
+            or time.monotonic() - _last_usage_flush >= USAGE_FLUSH_INTERVAL
+        )
+    if due:
+        flush_usage()
 
-    # Update totals
-    data["totals"]["requests"] += 1
-    data["totals"]["prompt_tokens"] += request_log["prompt_tokens"]
-    data["totals"]["completion_tokens"] += request_log["completion_tokens"]
-    data["totals"]["total_tokens"] += request_log["total_tokens"]
 
-    with open(usage_file, "w") as f:
-        json.dump(data, f, indent=2)
+def _file_key(path: Path) -> Optional[tuple[int, int]]:
+    """Get (mtime_ns, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_usage_rollup() -> tuple[deque, dict]:
+    """Get the recent-requests ring buffer and totals, reloading if another process wrote them."""
+    key = _file_key(USAGE_FILE)
+    if _usage_rollup[0] == key and _usage_rollup[1] is not None:
+        return _usage_rollup[1], _usage_rollup[2]
+
+    data = {}
+    if key is not None:
+        data = jsonio.load_file(USAGE_FILE)
+    requests = deque(data.get("requests", []), maxlen=USAGE_RECENT_REQUESTS)
+    totals = {
+        "requests": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        **data.get("totals", {}),
+    }
+    _usage_rollup[:] = [key, requests, totals]
+    return requests, totals
 
 
-def call_llm(
-    prompt: str, system_prompt: str = "", config: Optional[dict] = None, json_mode: bool = False
-) -> tuple[str, str]:
-    """Call the local LLM endpoint."""
-    import time
+def save_usage_payload(payload: dict) -> str:
+    """Write a request's prompt/response payload by content hash. Returns the hash."""
+    data = jsonio.dumps(payload, indent=False)
+    ref = hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+    path = USAGE_PAYLOADS_DIR / f"{ref}.json"
+    if not path.exists():
+        # Atomic, so a crash or a concurrent writer can't leave a torn file behind
+        jsonio.dump_file(payload, path, indent=False)
+    return ref
+
+
+def load_usage_payload(ref: str) -> Optional[dict]:
+    """Load a request payload saved by save_usage_payload."""
+    if not re.fullmatch(r"[0-9a-f]{32}", ref):
+        return None
+    path = USAGE_PAYLOADS_DIR / f"{ref}.json"
+    if not path.exists():
+        return None
+    return jsonio.load_file(path)
 
+
+def rotate_usage_log() -> None:
+    """Move usage.jsonl into monthly gzip archives once it passes USAGE_LOG_MAX_BYTES.
+
+    Each record goes to the archive for the month of its own timestamp, so a
+    rotation just after a month boundary doesn't mix months.
+    """
+    try:
+        if USAGE_LOG_FILE.stat().st_size < USAGE_LOG_MAX_BYTES:
+            return
+        # Rename first so appends from other processes start a fresh log
+        rotating = USAGE_LOG_FILE.with_name(f".{USAGE_LOG_FILE.name}.{os.getpid()}")
+        USAGE_LOG_FILE.rename(rotating)
+    except FileNotFoundError:
+        return
+
+    by_month = defaultdict(list)
+    current_month = time.strftime("%Y%m", time.gmtime())
+    with open(rotating, "rb") as f:
+        for line in f:
+            try:
+                timestamp = jsonio.loads(line).get("timestamp") or ""
+            except ValueError:
+                timestamp = ""
+            # Timestamps are UTC ISO strings: YYYY-MM-...
+            month = timestamp[:7].replace("-", "")
+            by_month[month if len(month) == 6 else current_month].append(line)
+
+    for month, lines in by_month.items():
+        archive = USAGE_LOG_FILE.with_name(f"usage.{month}.jsonl.gz")
+        # Each rotation appends a gzip member; zcat and gzip.open read them as one stream
+        with gzip.open(archive, "ab") as f:
+            f.writelines(lines)
+    rotating.unlink()
+
+
+def flush_usage() -> None:
+    """Append queued usage to usage.jsonl and refresh the usage.json rollup."""
+    global _last_usage_flush
+
+    with _usage_lock:
+        _last_usage_flush = time.monotonic()
+        if not _pending_usage:
+            return
+        pending = _pending_usage[:]
+        _pending_usage.clear()
+
+        USAGE_PAYLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        for record in pending:
+            record["payload_ref"] = save_usage_payload(record.pop("payload"))
+
+        with open(USAGE_LOG_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(jsonio.dumps(r, indent=False) + "\n" for r in pending))
+        rotate_usage_log()
+
+        requests, totals = _load_usage_rollup()
+        evicted = list(requests)[max(0, USAGE_RECENT_REQUESTS - len(pending)) :]
+        requests.extendleft(pending)
+
+        # Payloads are only kept for requests still shown on the dashboard
+        live_refs = {r.get("payload_ref") for r in requests}
+        for record in evicted:
+            ref = record.get("payload_ref")
+            if ref and ref not in live_refs:
+                (USAGE_PAYLOADS_DIR / f"{ref}.json").unlink(missing_ok=True)
+        totals["requests"] += len(pending)
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            totals[key] += sum(r[key] for r in pending)
+
+        jsonio.dump_file({"requests": list(requests), "totals": totals}, USAGE_FILE, indent=False)
+        _usage_rollup[0] = _file_key(USAGE_FILE)
+        jsonio.dump_file(totals, USAGE_TOTALS_FILE, indent=False)
+
+
+atexit.register(flush_usage)
+
+
+def build_llm_request(
+    prompt: str, system_prompt: str = "", config: Optional[dict] = None, json_mode: bool = False
+) -> tuple[str, dict, dict]:
+    """Build the chat completion request. Returns (url, headers, payload) tuple."""
     if config is None:
         config = load_config()
 
@@ -144,43 +316,95 @@ def call_llm(
     if json_mode:
         payload["response_format"] = {"type": "json_object"}
 
+    return f"{base_url}/chat/completions", headers, payload
+
+
+def parse_llm_response(data: dict, payload: dict, latency_ms: int) -> tuple[str, str]:
+    """Extract content and reasoning from a chat completion, logging its usage."""
+    # Handle reasoning models - get content from the right place
+    choice = data["choices"][0]
+    content = choice["message"].get("content") or ""
+    reasoning = choice["message"].get("reasoning_content") or ""
+
+    # Log usage with full content
+    usage = data.get("usage", {})
+    if usage:
+        log_usage(
+            usage=usage,
+            model=payload["model"],
+            latency_ms=latency_ms,
+            messages=payload["messages"],
+            response_content=content,
+            reasoning_content=reasoning,
+        )
+
+    return content, reasoning
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared pooled HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(limits=HTTP_LIMITS, timeout=300)
+        return _client
+
+
+def get_endpoint_configs(config: dict) -> list[dict]:
+    """Get one config per LLM endpoint in llm.base_urls, or just config if unset."""
+    llm_config = config.get("llm", {})
+    base_urls = llm_config.get("base_urls")
+    if not base_urls:
+        return [config]
+    return [{**config, "llm": {**llm_config, "base_url": url}} for url in base_urls]
+
+
+def call_llm(
+    prompt: str, system_prompt: str = "", config: Optional[dict] = None, json_mode: bool = False
+) -> tuple[str, str]:
+    """Call the local LLM endpoint."""
+    url, headers, payload = build_llm_request(prompt, system_prompt, config, json_mode)
+
     try:
         start_time = time.time()
-        response = httpx.post(
-            f"{base_url}/chat/completions",
-            json=payload,
-            headers=headers,
-            timeout=300,  # 5 min timeout for large context
-        )
+        # 5 min client timeout for large context
+        response = get_http_client().post(url, json=payload, headers=headers)
         latency_ms = int((time.time() - start_time) * 1000)
         response.raise_for_status()
-        data = response.json()
-
-        # Handle reasoning models - get content from the right place
-        choice = data["choices"][0]
-        content = choice["message"].get("content") or ""
-        reasoning = choice["message"].get("reasoning_content") or ""
-
-        # Log usage with full content
-        usage = data.get("usage", {})
-        if usage:
-            log_usage(
-                usage=usage,
-                model=model,
-                latency_ms=latency_ms,
-                messages=messages,
-                response_content=content,
-                reasoning_content=reasoning,
-            )
+        return parse_llm_response(jsonio.loads(response.content), payload, latency_ms)
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"LLM call failed: {e}")
+        logger.error(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        logger.error(f"LLM call failed: {e}")
+        raise
+
 
-        return content, reasoning
+async def call_llm_async(
+    client: httpx.AsyncClient,
+    prompt: str,
+    system_prompt: str = "",
+    config: Optional[dict] = None,
+    json_mode: bool = False,
+) -> tuple[str, str]:
+    """Call the LLM endpoint on a shared async client."""
+    url, headers, payload = build_llm_request(prompt, system_prompt, config, json_mode)
+
+    try:
+        start_time = time.time()
+        response = await client.post(url, json=payload, headers=headers)
+        latency_ms = int((time.time() - start_time) * 1000)
+        response.raise_for_status()
+        return parse_llm_response(jsonio.loads(response.content), payload, latency_ms)
 
     except httpx.HTTPStatusError as e:
-        print(f"LLM call failed: {e}")
-        print(f"Response body: {e.response.text}")
+        logger.error(f"LLM call failed: {e}")
+        logger.error(f"Response body: {e.response.text}")
         raise
     except Exception as e:
-        print(f"LLM call failed: {e}")
+        logger.error(f"LLM call failed: {e}")
         raise
 
 
@@ -325,12 +549,41 @@ IMPORTANT: Include the actual Reddit URLs from each post (they look like https:/
 Return ONLY valid JSON, no markdown code blocks or other text."""
 
 
+def compile_prompt(template: str) -> list[tuple[str, Optional[str]]]:
+    """Pre-parse a str.format template into (literal, field) pairs."""
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+
+def render_prompt(compiled: list[tuple[str, Optional[str]]], **fields) -> str:
+    """Render a template from compile_prompt, like str.format with plain fields."""
+    parts = []
+    for literal, field in compiled:
+        parts.append(literal)
+        if field is not None:
+            parts.append(str(fields[field]))
+    return "".join(parts)
+
+
+# The user prompts are long JSON examples with a few fields; parse them once
+ANALYSIS_USER_TEMPLATE = compile_prompt(ANALYSIS_USER_PROMPT)
+NEWS_USER_TEMPLATE = compile_prompt(NEWS_USER_PROMPT)
+
+# (system prompt, compiled user prompt) per scrape mode
+MODE_PROMPTS = {
+    "news": (NEWS_SYSTEM_PROMPT, NEWS_USER_TEMPLATE),
+    "opportunities": (ANALYSIS_SYSTEM_PROMPT, ANALYSIS_USER_TEMPLATE),
+}
+
+
 def format_posts_for_analysis(posts: list[dict]) -> str:
     """Format posts for LLM consumption."""
 
-    formatted = []
+    parts = []
     for i, post in enumerate(posts, 1):
-        entry = f"""
+        if i > 1:
+            parts.append("\n---\n")
+        parts.append(
+            f"""
 ### Post {i}: {post["title"]}
 - Subreddit: r/{post["subreddit"]}
 - Upvotes: {post["upvotes"]} | Comments: {post["num_comments"]}
@@ -338,50 +591,141 @@ def format_posts_for_analysis(posts: list[dict]) -> str:
 - URL: {post["url"]}
 
 Content:
-{post.get("selftext", "(no text)")[:1500]}
+{(post.get("selftext") or "(no text)")[:MAX_POST_TEXT_CHARS]}
 """
+        )
 
-        if post.get("comments"):
-            entry += "\nTop Comments:\n"
-            for j, comment in enumerate(post["comments"][:5], 1):
-                entry += f"  {j}. [{comment['upvotes']} upvotes] {comment['body'][:300]}\n"
+        comments = post.get("comments")
+        if comments:
+            parts.append("\nTop Comments:\n")
+            parts.append(
+                "".join(
+                    f"  {j}. [{comment['upvotes']} upvotes] {comment['body'][:MAX_COMMENT_CHARS]}\n"
+                    for j, comment in enumerate(comments[:MAX_COMMENTS_PER_POST], 1)
+                )
+            )
 
-        formatted.append(entry)
+    return "".join(parts)
 
-    return "\n---\n".join(formatted)
 
+def post_fingerprint(post: dict) -> str:
+    """Fingerprint a post by its normalized title and body text.
+
+    Reposts and crossposts with the same wording share a fingerprint even
+    though their Reddit IDs differ.
+    """
+    text = f"{post.get('title') or ''} {post.get('selftext') or ''}".lower()
+    normalized = " ".join(WORD_PATTERN.findall(text))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _load_analyzed_posts() -> dict:
+    """Load the analyzed-post fingerprints, keyed by focus area."""
+    if ANALYZED_POSTS_FILE.exists():
+        return jsonio.load_file(ANALYZED_POSTS_FILE)
+    return {}
 
-def analyze_batch(
-    posts: list[dict],
-    scrape_data: dict,
-    config: dict,
-    batch_num: int = 1,
-    total_batches: int = 1,
-) -> dict:
-    """Analyze a single batch of posts."""
 
+def filter_analyzed_posts(posts: list[dict], focus_area: str) -> tuple[list[dict], int]:
+    """Drop posts that were already analyzed for this focus area.
+
+    Returns (fresh_posts, skipped_count) tuple.
+    """
+    seen = _load_analyzed_posts().get(focus_area, {})
+    fresh = [p for p in posts if post_fingerprint(p) not in seen]
+    return fresh, len(posts) - len(fresh)
+
+
+def record_analyzed_posts(posts: list[dict], focus_area: str) -> None:
+    """Remember analyzed posts so later scans can skip them."""
+    data = _load_analyzed_posts()
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=ANALYZED_POST_TTL_DAYS)).isoformat()
+
+    seen = {fp: ts for fp, ts in data.get(focus_area, {}).items() if ts >= cutoff}
+    now_iso = now.isoformat()
+    for post in posts:
+        seen[post_fingerprint(post)] = now_iso
+    data[focus_area] = seen
+
+    ANALYZED_POSTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    jsonio.dump_file(data, ANALYZED_POSTS_FILE, indent=False)
+
+
+def build_batch_prompt(posts: list[dict], scrape_data: dict) -> tuple[str, str]:
+    """Build the prompts for a batch. Returns (system_prompt, prompt) tuple."""
     posts_content = format_posts_for_analysis(posts)
     mode = scrape_data.get("mode", "opportunities")
-
-    if mode == "news":
-        system_prompt = NEWS_SYSTEM_PROMPT
-        user_prompt_template = NEWS_USER_PROMPT
-    else:
-        system_prompt = ANALYSIS_SYSTEM_PROMPT
-        user_prompt_template = ANALYSIS_USER_PROMPT
+    system_prompt, user_prompt_template = MODE_PROMPTS.get(mode, MODE_PROMPTS["opportunities"])
 
     # Get unique subreddits in this batch
-    batch_subreddits = list(set(p["subreddit"] for p in posts))
+    batch_subreddits = list(dict.fromkeys(p["subreddit"] for p in posts))
 
-    prompt = user_prompt_template.format(
+    prompt = render_prompt(
+        user_prompt_template,
         focus_name=scrape_data["focus_name"],
         keywords=", ".join(scrape_data.get("keywords", [])),
         total_posts=len(posts),
         subreddits=", ".join(batch_subreddits),
         posts_content=posts_content,
     )
+    return system_prompt, prompt
+
+
+def parse_analysis(content: str) -> dict:
+    """Parse the JSON object out of an LLM analysis response."""
+    json_start = content.find("{")
+    if json_start < 0:
+        return {"error": "Could not parse JSON", "raw_response": content[:500]}
+    try:
+        # Decode one object from the first brace, ignoring any trailing commentary
+        analysis, _ = JSON_DECODER.raw_decode(content, json_start)
+    except json.JSONDecodeError as e:
+        return {"error": f"JSON parse error: {e}", "raw_response": content[:500]}
+    if not isinstance(analysis, dict):
+        return {"error": "Response JSON is not an object", "raw_response": content[:500]}
+    return normalize_analysis(analysis)
+
+
+def normalize_analysis(analysis: dict) -> dict:
+    """Coerce LLM output to the shapes the merge code expects.
+
+    Item lists keep only objects, with their dedup key as a string, and
+    string lists keep only strings, so a malformed field is dropped here
+    instead of failing later in a merge.
+    """
+    for field, key in ANALYSIS_ITEM_FIELDS.items():
+        if field not in analysis:
+            continue
+        items = analysis[field] if isinstance(analysis[field], list) else []
+        items = [item for item in items if isinstance(item, dict)]
+        for item in items:
+            if not isinstance(item.get(key, ""), str):
+                item[key] = "" if item[key] is None else str(item[key])
+        analysis[field] = items
+
+    for field in ANALYSIS_STRING_FIELDS:
+        if field in analysis:
+            values = analysis[field] if isinstance(analysis[field], list) else []
+            analysis[field] = [v for v in values if isinstance(v, str)]
+
+    summary = analysis.get("executive_summary", "")
+    if not isinstance(summary, str):
+        analysis["executive_summary"] = "" if summary is None else str(summary)
+    return analysis
+
+
+def analyze_batch(
+    posts: list[dict],
+    scrape_data: dict,
+    config: dict,
+    batch_num: int = 1,
+    total_batches: int = 1,
+) -> dict:
+    """Analyze a single batch of posts."""
+    system_prompt, prompt = build_batch_prompt(posts, scrape_data)
 
-    print(f"  Batch {batch_num}/{total_batches}: Analyzing {len(posts)} posts...")
+    logger.debug(f"  Batch {batch_num}/{total_batches}: Analyzing {len(posts)} posts...")
 
     content, reasoning = call_llm(
         prompt=prompt,
@@ -389,17 +733,259 @@ def analyze_batch(
         config=config,
         json_mode=False,
     )
+    return parse_analysis(content)
+
+
+def analyze_batch_with_split(
+    posts: list[dict],
+    scrape_data: dict,
+    config: dict,
+    batch_num: int = 1,
+    total_batches: int = 1,
+    analyzed: Optional[list] = None,
+) -> dict:
+    """Analyze a batch, splitting it in half and retrying if the response can't be parsed.
+
+    Posts whose analysis succeeded (all of them, or only the halves that
+    parsed) are appended to analyzed, if given.
+    """
+
+    result = analyze_batch(posts, scrape_data, config, batch_num, total_batches)
+    if "error" not in result:
+        if analyzed is not None:
+            analyzed.extend(posts)
+        return result
+    if len(posts) < 2 * MIN_SPLIT_SIZE:
+        return result
+
+    mid = len(posts) // 2
+    logger.warning(
+        f"  Batch {batch_num} response was malformed, retrying as two batches of ~{mid} posts"
+    )
+    halves = [
+        analyze_batch_with_split(half, scrape_data, config, batch_num, total_batches, analyzed)
+        for half in (posts[:mid], posts[mid:])
+    ]
+    valid = [h for h in halves if "error" not in h]
+    if not valid:
+        return result
+
+    return merge_batch_analyses(valid, scrape_data.get("mode", "opportunities"))
+
+
+async def analyze_batch_async(
+    client: httpx.AsyncClient,
+    posts: list[dict],
+    scrape_data: dict,
+    config: dict,
+    batch_num: int = 1,
+    total_batches: int = 1,
+    analyzed: Optional[list] = None,
+) -> dict:
+    """Async version of analyze_batch_with_split."""
+    system_prompt, prompt = build_batch_prompt(posts, scrape_data)
+
+    logger.debug(f"  Batch {batch_num}/{total_batches}: Analyzing {len(posts)} posts...")
+
+    content, reasoning = await call_llm_async(client, prompt, system_prompt, config)
+    result = parse_analysis(content)
+    if "error" not in result:
+        if analyzed is not None:
+            analyzed.extend(posts)
+        return result
+    if len(posts) < 2 * MIN_SPLIT_SIZE:
+        return result
+
+    mid = len(posts) // 2
+    logger.warning(
+        f"  Batch {batch_num} response was malformed, retrying as two batches of ~{mid} posts"
+    )
+    halves = await asyncio.gather(
+        *(
+            analyze_batch_async(
+                client, half, scrape_data, config, batch_num, total_batches, analyzed
+            )
+            for half in (posts[:mid], posts[mid:])
+        )
+    )
+    valid = [h for h in halves if "error" not in h]
+    if not valid:
+        return result
+
+    return merge_batch_analyses(valid, scrape_data.get("mode", "opportunities"))
+
 
-    # Parse JSON
+async def analyze_batches_async(
+    batches: list[list[dict]],
+    scrape_data: dict,
+    config: dict,
+    progress_callback: Optional[callable] = None,
+    analyzed: Optional[list] = None,
+) -> list:
+    """Analyze batches concurrently. Results (or exceptions) are in batch order.
+
+    Batches are assigned round-robin across llm.base_urls, each endpoint
+    with its own llm.max_concurrency limit. Successfully analyzed posts are
+    appended to analyzed, if given.
+    """
+    endpoints = get_endpoint_configs(config)
+    max_concurrency = config.get("llm", {}).get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+    semaphores = [asyncio.Semaphore(max(1, max_concurrency)) for _ in endpoints]
+    total_batches = len(batches)
+    completed = 0
+
+    async def run(batch_num: int, batch: list[dict]) -> dict:
+        nonlocal completed
+        endpoint = (batch_num - 1) % len(endpoints)
+        async with semaphores[endpoint]:
+            result = await analyze_batch_async(
+                client, batch, scrape_data, endpoints[endpoint], batch_num, total_batches, analyzed
+            )
+        completed += 1
+        if progress_callback:
+            pct = int(completed / total_batches * 100)
+            progress_callback(pct, f"Analyzed batch {completed}/{total_batches}")
+        return result
+
+    async with httpx.AsyncClient(limits=HTTP_LIMITS, timeout=300) as client:
+        return await asyncio.gather(
+            *(run(i, batch) for i, batch in enumerate(batches, 1)), return_exceptions=True
+        )
+
+
+def analyze_batches_with_batch_api(
+    batches: list[list[dict]],
+    scrape_data: dict,
+    config: dict,
+    progress_callback: Optional[callable] = None,
+    analyzed: Optional[list] = None,
+) -> Optional[list[dict]]:
+    """Run all batches as one OpenAI-style /batches job.
+
+    Returns results in batch order, or None if the endpoint doesn't support
+    the batch API or the job didn't complete, so the caller can fall back.
+    Successfully analyzed posts are appended to analyzed, if given.
+    """
+    if not batches:
+        return []
+
+    requests = []
+    for batch in batches:
+        system_prompt, prompt = build_batch_prompt(batch, scrape_data)
+        url, headers, payload = build_llm_request(prompt, system_prompt, config)
+        requests.append(payload)
+    base_url = url.rsplit("/chat/completions", 1)[0]
+    auth_headers = {k: v for k, v in headers.items() if k != "Content-Type"}
+    client = get_http_client()
+    timeout = config.get("llm", {}).get("batch_timeout", BATCH_API_TIMEOUT)
+
+    lines = [
+        jsonio.dumps(
+            {
+                "custom_id": f"batch-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": payload,
+            },
+            indent=False,
+        )
+        for i, payload in enumerate(requests)
+    ]
+
+    start_time = time.time()
     try:
-        json_start = content.find("{")
-        json_end = content.rfind("}") + 1
-        if json_start >= 0 and json_end > json_start:
-            return json.loads(content[json_start:json_end])
-        else:
-            return {"error": "Could not parse JSON", "raw_response": content[:500]}
-    except json.JSONDecodeError as e:
-        return {"error": f"JSON parse error: {e}", "raw_response": content[:500]}
+        response = client.post(
+            f"{base_url}/files",
+            headers=auth_headers,
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", "\n".join(lines).encode())},
+        )
+        if response.status_code in (404, 405, 501):
+            logger.info("Batch API not supported by this endpoint, sending batches individually")
+            return None
+        response.raise_for_status()
+
+        response = client.post(
+            f"{base_url}/batches",
+            headers=headers,
+            json={
+                "input_file_id": jsonio.loads(response.content)["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        if response.status_code in (404, 405, 501):
+            logger.info("Batch API not supported by this endpoint, sending batches individually")
+            return None
+        response.raise_for_status()
+        job = jsonio.loads(response.content)
+        logger.info(f"Submitted {len(requests)} batches as batch job {job['id']}")
+
+        while job["status"] not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() - start_time > timeout:
+                client.post(f"{base_url}/batches/{job['id']}/cancel", headers=headers)
+                logger.warning(f"Batch job {job['id']} timed out after {timeout}s")
+                return None
+            time.sleep(BATCH_API_POLL_INTERVAL)
+            response = client.get(f"{base_url}/batches/{job['id']}", headers=headers)
+            response.raise_for_status()
+            job = jsonio.loads(response.content)
+            if progress_callback:
+                counts = job.get("request_counts") or {}
+                done = counts.get("completed", 0) + counts.get("failed", 0)
+                pct = int(done / len(requests) * 100)
+                progress_callback(pct, f"Batch job: {done}/{len(requests)} batches done")
+
+        if job["status"] != "completed" or not job.get("output_file_id"):
+            logger.warning(f"Batch job {job['id']} ended with status {job['status']}")
+            return None
+
+        response = client.get(f"{base_url}/files/{job['output_file_id']}/content", headers=headers)
+        response.raise_for_status()
+
+        latency_ms = int((time.time() - start_time) * 1000)
+        results = [{"error": "Missing from batch output"} for _ in requests]
+        for line in response.content.splitlines():
+            if not line.strip():
+                continue
+            entry = jsonio.loads(line)
+            index = int(entry["custom_id"].rsplit("-", 1)[1])
+            body = (entry.get("response") or {}).get("body")
+            if not body or "choices" not in body:
+                results[index] = {"error": f"Batch request failed: {entry.get('error')}"}
+                continue
+            content, _ = parse_llm_response(body, requests[index], latency_ms)
+            results[index] = parse_analysis(content)
+    except (httpx.HTTPError, KeyError, ValueError, IndexError) as e:
+        # Includes non-JSON poll bodies and malformed output lines
+        logger.warning(f"Batch API call failed: {e}")
+        return None
+
+    # Failed or malformed entries go through the normal per-batch path
+    for i, result in enumerate(results):
+        if "error" not in result:
+            if analyzed is not None:
+                analyzed.extend(batches[i])
+            continue
+        logger.warning(
+            f"  Batch {i + 1} failed in batch job ({result['error']}), retrying individually"
+        )
+        results[i] = analyze_batch_with_split(
+            batches[i], scrape_data, config, i + 1, len(batches), analyzed
+        )
+    return results
+
+
+def dedupe_by_field(items: list[dict], field: str, limit: Optional[int] = None) -> list[dict]:
+    """Keep the first item per case-insensitive field value, dropping blank ones."""
+    seen = set()
+    unique = []
+    for item in items:
+        value = item.get(field, "").lower().strip()
+        if value and value not in seen:
+            seen.add(value)
+            unique.append(item)
+    return unique[:limit] if limit else unique
 
 
 def merge_batch_analyses(analyses: list[dict], mode: str = "opportunities") -> dict:
@@ -431,37 +1017,16 @@ def merge_batch_analyses(analyses: list[dict], mode: str = "opportunities") -> d
             merged["executive_summary"] = " ".join(summaries[:3])  # Take first 3
 
         # Deduplicate top stories by headline
-        seen_headlines = set()
-        unique_stories = []
-        for story in merged["top_stories"]:
-            headline = story.get("headline", "").lower().strip()
-            if headline and headline not in seen_headlines:
-                seen_headlines.add(headline)
-                unique_stories.append(story)
-        merged["top_stories"] = unique_stories[:15]  # Keep top 15
+        merged["top_stories"] = dedupe_by_field(merged["top_stories"], "headline", 15)
 
         # Deduplicate releases by name
-        seen_releases = set()
-        unique_releases = []
-        for release in merged["notable_releases"]:
-            name = release.get("name", "").lower().strip()
-            if name and name not in seen_releases:
-                seen_releases.add(name)
-                unique_releases.append(release)
-        merged["notable_releases"] = unique_releases[:10]
+        merged["notable_releases"] = dedupe_by_field(merged["notable_releases"], "name", 10)
 
         # Deduplicate tools
-        seen_tools = set()
-        unique_tools = []
-        for tool in merged["tools_mentioned"]:
-            name = tool.get("name", "").lower().strip()
-            if name and name not in seen_tools:
-                seen_tools.add(name)
-                unique_tools.append(tool)
-        merged["tools_mentioned"] = unique_tools[:15]
+        merged["tools_mentioned"] = dedupe_by_field(merged["tools_mentioned"], "name", 15)
 
         # Dedupe takeaways
-        merged["key_takeaways"] = list(set(merged["key_takeaways"]))[:10]
+        merged["key_takeaways"] = list(dict.fromkeys(merged["key_takeaways"]))[:10]
 
     else:
         # Opportunities mode merging
@@ -488,27 +1053,13 @@ def merge_batch_analyses(analyses: list[dict], mode: str = "opportunities") -> d
             merged["executive_summary"] = " ".join(summaries[:3])
 
         # Deduplicate opportunities by title
-        seen_titles = set()
-        unique_opps = []
-        for opp in merged["opportunities"]:
-            title = opp.get("title", "").lower().strip()
-            if title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_opps.append(opp)
-        merged["opportunities"] = unique_opps
+        merged["opportunities"] = dedupe_by_field(merged["opportunities"], "title")
 
         # Deduplicate pain points
-        seen_problems = set()
-        unique_pains = []
-        for pain in merged["pain_points"]:
-            problem = pain.get("problem", "").lower().strip()
-            if problem and problem not in seen_problems:
-                seen_problems.add(problem)
-                unique_pains.append(pain)
-        merged["pain_points"] = unique_pains
+        merged["pain_points"] = dedupe_by_field(merged["pain_points"], "problem")
 
         # Dedupe trending topics and actions
-        merged["trending_topics"] = list(set(merged["trending_topics"]))[:20]
+        merged["trending_topics"] = list(dict.fromkeys(merged["trending_topics"]))[:20]
         merged["recommended_actions"] = list(dict.fromkeys(merged["recommended_actions"]))[:10]
 
     return merged
@@ -519,44 +1070,69 @@ def analyze_scrape_data(
     config: Optional[dict] = None,
     batch_size: int = 50,
     progress_callback: Optional[callable] = None,
+    skip_analyzed: bool = True,
 ) -> dict:
     """Analyze scraped data using the LLM, with batching for large datasets."""
 
     if config is None:
         config = load_config()
 
+    batch_size = config.get("llm", {}).get("batch_size", batch_size)
     posts = scrape_data["posts"]
-    total_posts = len(posts)
     mode = scrape_data.get("mode", "opportunities")
 
-    print(f"Analyzing {total_posts} posts...")
+    cached_posts = 0
+    if skip_analyzed:
+        posts, cached_posts = filter_analyzed_posts(posts, scrape_data["focus_area"])
+        if cached_posts:
+            logger.info(f"Skipping {cached_posts} posts already analyzed in earlier scans")
+    total_posts = len(posts)
+
+    logger.info(f"Analyzing {total_posts} posts...")
 
-    # If small enough, analyze in one go
-    if total_posts <= batch_size:
-        analysis = analyze_batch(posts, scrape_data, config, 1, 1)
+    # Only posts whose batch (or split half) parsed are remembered as analyzed
+    analyzed = []
+    if not posts:
+        # Nothing new - earlier findings are already in the merged report
+        analysis = {}
+        if progress_callback:
+            progress_callback(100, "Analysis complete")
+    elif total_posts <= batch_size:
+        # If small enough, analyze in one go
+        analysis = analyze_batch_with_split(posts, scrape_data, config, 1, 1, analyzed)
         if progress_callback:
             progress_callback(100, "Analysis complete")
     else:
         # Split into batches
         batches = [posts[i : i + batch_size] for i in range(0, total_posts, batch_size)]
         total_batches = len(batches)
-        print(f"Splitting into {total_batches} batches of ~{batch_size} posts each")
+        logger.info(f"Splitting into {total_batches} batches of ~{batch_size} posts each")
 
-        batch_analyses = []
-        for i, batch in enumerate(batches, 1):
-            if progress_callback:
-                pct = int((i - 1) / total_batches * 100)
-                progress_callback(pct, f"Analyzing batch {i}/{total_batches}")
+        if progress_callback:
+            progress_callback(0, f"Analyzing {total_batches} batches")
+
+        results = None
+        if config.get("llm", {}).get("use_batch_api"):
+            results = analyze_batches_with_batch_api(
+                batches, scrape_data, config, progress_callback, analyzed
+            )
+        if results is None:
+            results = asyncio.run(
+                analyze_batches_async(batches, scrape_data, config, progress_callback, analyzed)
+            )
 
-            batch_result = analyze_batch(batch, scrape_data, config, i, total_batches)
-            if "error" not in batch_result:
+        batch_analyses = []
+        for i, batch_result in enumerate(results, 1):
+            if isinstance(batch_result, Exception):
+                logger.warning(f"  Batch {i} failed: {batch_result}")
+            elif "error" not in batch_result:
                 batch_analyses.append(batch_result)
             else:
-                print(f"  Batch {i} had error: {batch_result.get('error')}")
+                logger.warning(f"  Batch {i} had error: {batch_result.get('error')}")
 
         # Merge all batch results
         if batch_analyses:
-            print(f"Merging {len(batch_analyses)} batch results...")
+            logger.info(f"Merging {len(batch_analyses)} batch results...")
             analysis = merge_batch_analyses(batch_analyses, mode)
         else:
             analysis = {"error": "All batches failed", "opportunities": [], "pain_points": []}
@@ -564,27 +1140,47 @@ def analyze_scrape_data(
         if progress_callback:
             progress_callback(100, "Analysis complete")
 
-    # Build the report
-    report = {
-        "id": f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+    if analyzed:
+        record_analyzed_posts(analyzed, scrape_data["focus_area"])
+    flush_usage()
+
+    batches_used = (total_posts + batch_size - 1) // batch_size if total_posts > batch_size else 1
+    failed_posts = total_posts - len(analyzed)
+    return build_report(scrape_data, analysis, config, batches_used, cached_posts, failed_posts)
+
+
+def build_report(
+    scrape_data: dict,
+    analysis: dict,
+    config: dict,
+    batches_used: int = 1,
+    cached_posts: int = 0,
+    failed_posts: int = 0,
+) -> dict:
+    """Build a report from scrape data and its merged analysis.
+
+    failed_posts counts posts whose batch never parsed, so they aren't in it.
+    """
+    # One clock read, so the id and generated_at always name the same second
+    now = time.time()
+    return {
+        "id": f"report_{time.strftime('%Y%m%d_%H%M%S', time.localtime(now))}",
         "focus_area": scrape_data["focus_area"],
         "focus_name": scrape_data["focus_name"],
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
         "data_scraped_at": scrape_data["scraped_at"],
         "subreddits_analyzed": scrape_data["subreddits"],
-        "posts_analyzed": total_posts,
+        "posts_analyzed": len(scrape_data["posts"]),
         "analysis": analysis,
         "metadata": {
             "model": config.get("llm", {}).get("model", "unknown"),
             "source_file": scrape_data.get("source_file", "unknown"),
-            "batches_used": (total_posts + batch_size - 1) // batch_size
-            if total_posts > batch_size
-            else 1,
+            "batches_used": batches_used,
+            "cached_posts": cached_posts,
+            "failed_posts": failed_posts,
         },
     }
 
-    return report
-
 
 def get_report_path(focus_area: str, output_dir: Optional[Path] = None) -> Path:
     """Get the canonical path for a focus area's report."""
@@ -593,15 +1189,50 @@ def get_report_path(focus_area: str, output_dir: Optional[Path] = None) -> Path:
     return output_dir / f"report_{focus_area}.json"
 
 
+def get_summary_path(report_path: Path) -> Path:
+    """Get the dashboard summary sidecar for a report file."""
+    return report_path.with_name(f"{report_path.stem}.summary.json")
+
+
+def build_report_summary(report: dict, report_path: Path) -> dict:
+    """Extract the fields the dashboard lists for a report."""
+    analysis = report.get("analysis", {})
+    return {
+        "id": report.get("id", report_path.stem),
+        "focus_area": report.get("focus_area", "unknown"),
+        "focus_name": report.get("focus_name", "Unknown"),
+        # Older reports only have generated_at
+        "created_at": report.get("created_at") or report.get("generated_at", ""),
+        "updated_at": report.get("updated_at") or report.get("generated_at", ""),
+        "total_scans": report.get("total_scans", 1),
+        "posts_analyzed": report.get("total_posts_analyzed") or report.get("posts_analyzed", 0),
+        "opportunities_count": len(analysis.get("opportunities", [])),
+        "pain_points_count": len(analysis.get("pain_points", [])),
+        "executive_summary": analysis.get("executive_summary", ""),
+    }
+
+
+def save_report_summary(report: dict, report_path: Path) -> dict:
+    """Write a report's summary sidecar so listings never parse the full report."""
+    summary = build_report_summary(report, report_path)
+    jsonio.dump_file(summary, get_summary_path(report_path), indent=False)
+    return summary
+
+
 def load_existing_report(focus_area: str, output_dir: Optional[Path] = None) -> Optional[dict]:
     """Load existing report for a focus area if it exists."""
     path = get_report_path(focus_area, output_dir)
     if path.exists():
-        with open(path) as f:
-            return json.load(f)
+        return jsonio.load_file(path)
     return None
 
 
+def analysis_hash(analysis: dict) -> str:
+    """Hash an analysis payload so identical scans can be detected cheaply."""
+    data = jsonio.dumps(analysis, indent=False, sort_keys=True)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
 def merge_reports(existing: dict, new_report: dict) -> dict:
     """Merge new analysis into existing report, deduplicating items."""
 
@@ -611,34 +1242,55 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
     # Detect if this is news mode (has top_stories) or opportunities mode
     is_news_mode = "top_stories" in new_analysis or "top_stories" in existing_analysis
 
-    # Helper for deduplication by field similarity
-    def is_duplicate(new_item, existing_list, field):
-        new_val = new_item.get(field, "").lower().strip()
-        if not new_val:
-            return False
-        for existing in existing_list:
-            existing_val = existing.get(field, "").lower().strip()
-            if new_val == existing_val:
-                return True
-            new_words = set(new_val.split())
-            existing_words = set(existing_val.split())
-            if new_words and existing_words:
-                overlap = len(new_words & existing_words) / max(len(new_words), len(existing_words))
-                if overlap > 0.7:
-                    return True
-        return False
-
     def merge_list(existing_list, new_list, dedup_field, limit=None):
         """Merge two lists with deduplication."""
         merged = list(existing_list)
         new_count = 0
+
+        # Index values once: exact matches are a set lookup, and shared-word
+        # counts for fuzzy matches come straight from the word -> entry postings
+        exact_values = set()
+        word_counts = []
+        postings = defaultdict(list)
+
+        def add_to_index(val, words):
+            exact_values.add(val)
+            for word in words:
+                postings[word].append(len(word_counts))
+            word_counts.append(len(words))
+
+        def is_fuzzy_duplicate(words):
+            # Entries whose size rules out the overlap are never counted, and
+            # counting stops at the first entry that crosses the threshold
+            n = len(words)
+            low, high = n * DUPLICATE_WORD_OVERLAP, n / DUPLICATE_WORD_OVERLAP
+            shared = defaultdict(int)
+            for word in words:
+                for i in postings.get(word, ()):
+                    size = word_counts[i]
+                    if size <= low or size >= high:
+                        continue
+                    shared[i] += 1
+                    if shared[i] / max(n, size) > DUPLICATE_WORD_OVERLAP:
+                        return True
+            return False
+
+        for item in merged:
+            val = item.get(dedup_field, "").lower().strip()
+            add_to_index(val, set(WORD_PATTERN.findall(val)))
+
+        added_at = new_report.get("generated_at", datetime.now(timezone.utc).isoformat())
         for item in new_list:
-            if not is_duplicate(item, merged, dedup_field):
-                item["added_at"] = new_report.get(
-                    "generated_at", datetime.now(timezone.utc).isoformat()
-                )
-                merged.append(item)
-                new_count += 1
+            val = item.get(dedup_field, "").lower().strip()
+            if val and val in exact_values:
+                continue
+            words = set(WORD_PATTERN.findall(val))
+            if val and is_fuzzy_duplicate(words):
+                continue
+            item["added_at"] = added_at
+            merged.append(item)
+            add_to_index(val, words)
+            new_count += 1
         if limit:
             merged = merged[:limit]
         return merged, new_count
@@ -646,7 +1298,16 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
     new_item_count = 0
     new_secondary_count = 0
 
-    if is_news_mode:
+    # A re-run over the same data (or one that found nothing) has nothing to merge
+    content_hash = analysis_hash(new_analysis)
+    scan_history = existing.get("scan_history", [])
+    unchanged = not new_analysis or (
+        scan_history and scan_history[-1].get("content_hash") == content_hash
+    )
+
+    if unchanged:
+        analysis = existing_analysis
+    elif is_news_mode:
         # NEWS MODE: Merge news-specific fields
         merged_stories, new_stories = merge_list(
             existing_analysis.get("top_stories", []),
@@ -676,11 +1337,7 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
         # Merge key takeaways (simple dedup)
         existing_takeaways = existing_analysis.get("key_takeaways", [])
         new_takeaways = new_analysis.get("key_takeaways", [])
-        merged_takeaways = list(existing_takeaways)
-        for t in new_takeaways:
-            if t not in merged_takeaways:
-                merged_takeaways.append(t)
-        merged_takeaways = merged_takeaways[:15]
+        merged_takeaways = list(dict.fromkeys(existing_takeaways + new_takeaways))[:15]
 
         analysis = {
             "executive_summary": new_analysis.get(
@@ -711,7 +1368,9 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
         merged_insights = list(existing_insights)
         existing_insight_texts = {i.get("insight", "").lower() for i in existing_insights}
         for insight in new_insights:
-            if insight.get("insight", "").lower() not in existing_insight_texts:
+            text = insight.get("insight", "").lower()
+            if text not in existing_insight_texts:
+                existing_insight_texts.add(text)
                 merged_insights.append(insight)
 
         analysis = {
@@ -722,7 +1381,7 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
             "pain_points": merged_pains,
             "market_insights": merged_insights,
             "trending_topics": list(
-                set(
+                dict.fromkeys(
                     existing_analysis.get("trending_topics", [])
                     + new_analysis.get("trending_topics", [])
                 )
@@ -735,7 +1394,6 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
         new_secondary_count = new_pains
 
     # Build scan history
-    scan_history = existing.get("scan_history", [])
     scan_history.append(
         {
             "scanned_at": new_report.get("generated_at"),
@@ -743,6 +1401,7 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
             "new_items": new_item_count,
             "new_secondary": new_secondary_count,
             "subreddits": new_report.get("subreddits_analyzed", []),
+            "content_hash": content_hash,
         }
     )
 
@@ -755,7 +1414,7 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
         "updated_at": new_report.get("generated_at"),
         "total_scans": len(scan_history),
         "subreddits_analyzed": list(
-            set(existing.get("subreddits_analyzed", []) + new_report.get("subreddits_analyzed", []))
+            dict.fromkeys(existing.get("subreddits_analyzed", []) + new_report.get("subreddits_analyzed", []))
         ),
         "total_posts_analyzed": existing.get(
             "total_posts_analyzed", existing.get("posts_analyzed", 0)
@@ -771,8 +1430,12 @@ def merge_reports(existing: dict, new_report: dict) -> dict:
 
 def save_report(
     report: dict, output_dir: Optional[Path] = None, merge: bool = True
-) -> tuple[Path, int, int]:
-    """Save the analysis report, optionally merging with existing."""
+) -> tuple[dict, Path, int, int]:
+    """Save the analysis report, optionally merging with existing.
+
+    Returns (saved_report, path, new_opportunities, new_pain_points); saved_report
+    is the merged report as written, so callers needn't read it back.
+    """
 
     if output_dir is None:
         output_dir = Path(__file__).parent.parent / "reports"
@@ -787,7 +1450,7 @@ def save_report(
         existing = load_existing_report(focus_area, output_dir)
         if existing:
             report, new_opps, new_pains = merge_reports(existing, report)
-            print(
+            logger.info(
                 f"Merged with existing report: +{new_opps} opportunities, +{new_pains} pain points"
             )
         else:
@@ -804,6 +1467,7 @@ def save_report(
                     "new_opportunities": len(report.get("analysis", {}).get("opportunities", [])),
                     "new_pain_points": len(report.get("analysis", {}).get("pain_points", [])),
                     "subreddits": report.get("subreddits_analyzed", []),
+                    "content_hash": analysis_hash(report.get("analysis", {})),
                 }
             ]
             new_opps = len(report.get("analysis", {}).get("opportunities", []))
@@ -812,11 +1476,11 @@ def save_report(
     # Always save to canonical path for focus area
     output_path = get_report_path(focus_area, output_dir)
 
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=2)
+    jsonio.dump_file(report, output_path, fsync=True)
+    save_report_summary(report, output_path)
 
-    print(f"Saved report to {output_path}")
-    return output_path, new_opps, new_pains
+    logger.info(f"Saved report to {output_path}")
+    return report, output_path, new_opps, new_pains
 
 
 def get_latest_scrape(focus_area: str, data_dir: Optional[Path] = None) -> Optional[Path]:
@@ -825,22 +1489,32 @@ def get_latest_scrape(focus_area: str, data_dir: Optional[Path] = None) -> Optio
     if data_dir is None:
         data_dir = Path(__file__).parent.parent / "data"
 
-    pattern = f"scrape_{focus_area}_*.json"
-    files = sorted(data_dir.glob(pattern), reverse=True)
+    # Names end in a sortable timestamp, so the newest is the greatest name;
+    # one scandir pass with plain string checks instead of glob + sort
+    prefix = f"scrape_{focus_area}_"
+    if not data_dir.exists():
+        return None
+    with os.scandir(data_dir) as it:
+        latest = max(
+            (e.name for e in it if e.name.startswith(prefix) and e.name.endswith(".json")),
+            default=None,
+        )
 
-    return files[0] if files else None
+    return data_dir / latest if latest else None
 
 
 def load_scrape_data(path: Path) -> dict:
     """Load scrape data from a file."""
-    with open(path) as f:
-        data = json.load(f)
+    data = jsonio.load_file(path)
     data["source_file"] = str(path)
+    # Decoding gives every post its own copy of the subreddit name; share one
+    for post in data.get("posts", []):
+        post["subreddit"] = sys.intern(post["subreddit"])
     return data
 
 
 if __name__ == "__main__":
-    import sys
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     focus = sys.argv[1] if len(sys.argv) > 1 else "saas_opportunities"
 
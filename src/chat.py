@@ -1,234 +1,468 @@
 """Chat functionality for discussing report insights with LLM."""
 
+import atexit
 import fcntl
-import json
-import uuid
+import hashlib
+import logging
+import queue
+import re
+import secrets
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
+import jsonio
 from analyzer import call_llm, load_config
 
+logger = logging.getLogger("reddar.chat")
+
 DATA_DIR = Path(__file__).parent.parent / "data"
-CHATS_FILE = DATA_DIR / "chats.json"
+CHATS_DIR = DATA_DIR / "chats"
+LEGACY_CHATS_FILE = DATA_DIR / "chats.json"
 LOCK_FILE = DATA_DIR / ".chats.lock"
 
+# Approximate token budget for conversation history sent with each turn
+DEFAULT_HISTORY_TOKENS = 8000
+CHARS_PER_TOKEN = 4
+
+# Stored message size caps; a huge paste would otherwise ride along in every later prompt
+MAX_MESSAGE_CHARS = {"user": 16000, "assistant": 64000}
+
+# How long the writer waits for more messages before flushing a burst
+WRITE_COALESCE_SECONDS = 0.05
+
+# Report IDs that can be used as file names as-is; others are hashed
+SAFE_REPORT_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+# Messages are appended to <id>.jsonl; <id>.meta.json is written once on creation
+# messages path -> ((mtime_ns, size), conversation) as last read or written here
+_conversation_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+# (focus_area, updated_at) -> formatted system prompt
+REPORT_CONTEXT_CACHE_SIZE = 64
+_report_context_cache: dict[tuple[Optional[str], str], str] = {}
+_migrated = False
+
 
 @contextmanager
 def _chats_lock():
-    """Context manager for exclusive access to chats file."""
+    """Context manager for exclusive access to the chat files."""
+    global _migrated
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(LOCK_FILE, "w") as lock:
         fcntl.flock(lock, fcntl.LOCK_EX)
         try:
+            if not _migrated:
+                _migrate_legacy_chats()
+                _migrated = True
             yield
         finally:
             fcntl.flock(lock, fcntl.LOCK_UN)
 
 
-def _load_chats_unlocked() -> dict:
-    """Load chats without locking (caller must hold lock)."""
-    if CHATS_FILE.exists():
-        with open(CHATS_FILE) as f:
-            return json.load(f)
-    return {"conversations": {}}
+def _conversation_paths(report_id: str) -> tuple[Path, Path]:
+    """Get the (messages, metadata) files for one report's conversation."""
+    if SAFE_REPORT_ID.fullmatch(report_id):
+        name = report_id
+    else:
+        name = f"id_{hashlib.sha1(report_id.encode()).hexdigest()}"
+    return CHATS_DIR / f"{name}.jsonl", CHATS_DIR / f"{name}.meta.json"
 
 
-def _save_chats_unlocked(data: dict) -> None:
-    """Save chats without locking (caller must hold lock)."""
-    with open(CHATS_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+def _file_key(path: Path) -> tuple[int, int]:
+    """Get (mtime_ns, size) for a file."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
 
 
-def load_chats() -> dict:
-    """Load all chat conversations from disk."""
-    with _chats_lock():
-        return _load_chats_unlocked()
+def _write_conversation(report_id: str, conversation: dict) -> None:
+    """Write a whole conversation as metadata plus a message log."""
+    messages_path, meta_path = _conversation_paths(report_id)
+    meta = {"report_id": report_id, "created_at": conversation.get("created_at")}
+    jsonio.dump_file(meta, meta_path, indent=False)
+    with open(messages_path, "w", encoding="utf-8") as f:
+        f.writelines(jsonio.dumps(m, indent=False) + "\n" for m in conversation["messages"])
 
 
-def save_chats(data: dict) -> None:
-    """Save chat conversations to disk."""
-    with _chats_lock():
-        _save_chats_unlocked(data)
+def _migrate_legacy_chats() -> None:
+    """Convert chats.json and per-report .json files to message logs (caller must hold lock)."""
+    legacy = []
+    if LEGACY_CHATS_FILE.exists():
+        legacy.append((LEGACY_CHATS_FILE, jsonio.load_file(LEGACY_CHATS_FILE)["conversations"]))
+    if CHATS_DIR.exists():
+        for path in CHATS_DIR.glob("*.json"):
+            if not path.name.endswith(".meta.json"):
+                conversation = jsonio.load_file(path)
+                legacy.append((path, {conversation.get("report_id", path.stem): conversation}))
 
+    for path, conversations in legacy:
+        CHATS_DIR.mkdir(parents=True, exist_ok=True)
+        for report_id, conversation in conversations.items():
+            if not _conversation_paths(report_id)[0].exists():
+                _write_conversation(report_id, conversation)
+        path.rename(path.with_suffix(".json.migrated"))
 
-def get_conversation(report_id: str) -> Optional[dict]:
-    """Get conversation history for a specific report."""
-    chats = load_chats()
-    return chats["conversations"].get(report_id)
 
+def _load_conversation_unlocked(report_id: str) -> Optional[dict]:
+    """Load a conversation without locking (caller must hold lock).
 
-def add_message(report_id: str, role: str, content: str) -> dict:
-    """Add a message to a conversation."""
+    The parsed log is cached until its mtime or size changes.
+    """
+    messages_path, meta_path = _conversation_paths(report_id)
+    try:
+        key = _file_key(messages_path)
+    except FileNotFoundError:
+        _conversation_cache.pop(messages_path, None)
+        return None
+
+    cached = _conversation_cache.get(messages_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    messages = []
+    with open(messages_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                messages.append(jsonio.loads(line))
+            except ValueError:
+                # A torn final line from an interrupted append
+                continue
+
+    meta = jsonio.load_file(meta_path) if meta_path.exists() else {}
+    first_ts = messages[0]["timestamp"] if messages else None
+    conversation = {
+        "report_id": report_id,
+        "created_at": meta.get("created_at") or first_ts,
+        "updated_at": messages[-1]["timestamp"] if messages else meta.get("created_at"),
+        "messages": messages,
+    }
+    _conversation_cache[messages_path] = (key, conversation)
+    return conversation
+
+
+def get_conversation(report_id: str) -> Optional[dict]:
+    """Get conversation history for a specific report.
+
+    Returns a copy, since the cached conversation is extended in place by
+    the background writer.
+    """
+    flush_chats()
     with _chats_lock():
-        chats = _load_chats_unlocked()
-
-        if report_id not in chats["conversations"]:
-            chats["conversations"][report_id] = {
-                "report_id": report_id,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-                "messages": [],
-            }
-
-        message = {
-            "id": f"msg_{uuid.uuid4().hex[:8]}",
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        conversation = _load_conversation_unlocked(report_id)
+        if conversation is None:
+            return None
+        return {**conversation, "messages": list(conversation["messages"])}
+
+
+def _truncate_content(role: str, content: str) -> str:
+    """Cap message content at its role's limit, marking what was cut."""
+    limit = MAX_MESSAGE_CHARS.get(role, MAX_MESSAGE_CHARS["user"])
+    if len(content) <= limit:
+        return content
+    return f"{content[:limit]}\n...[truncated {len(content) - limit} chars]"
+
+
+def _new_message(role: str, content: str) -> dict:
+    """Create a message record, with content capped for storage."""
+    return {
+        "id": f"msg_{secrets.token_hex(4)}",
+        "role": role,
+        "content": _truncate_content(role, content),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _append_messages_unlocked(report_id: str, messages: list[dict]) -> None:
+    """Append messages to a conversation's log with a single write (caller must hold lock)."""
+    messages_path, meta_path = _conversation_paths(report_id)
+    conversation = _load_conversation_unlocked(report_id)
+    if conversation is None:
+        CHATS_DIR.mkdir(parents=True, exist_ok=True)
+        created_at = messages[0]["timestamp"]
+        jsonio.dump_file(
+            {"report_id": report_id, "created_at": created_at}, meta_path, indent=False
+        )
+        conversation = {
+            "report_id": report_id,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "messages": [],
         }
 
-        chats["conversations"][report_id]["messages"].append(message)
-        chats["conversations"][report_id]["updated_at"] = message["timestamp"]
+    with open(messages_path, "a", encoding="utf-8") as f:
+        f.write("".join(jsonio.dumps(m, indent=False) + "\n" for m in messages))
+
+    conversation["messages"].extend(messages)
+    conversation["updated_at"] = messages[-1]["timestamp"]
+    _conversation_cache[messages_path] = (_file_key(messages_path), conversation)
 
-        _save_chats_unlocked(chats)
-        return message
+
+def _drain_writes() -> None:
+    """Write queued messages, coalescing bursts into one locked pass."""
+    while True:
+        batch = [_write_queue.get()]
+        while True:
+            try:
+                batch.append(_write_queue.get(timeout=WRITE_COALESCE_SECONDS))
+            except queue.Empty:
+                break
+
+        # Keep per-conversation order while merging each conversation's appends
+        by_report: dict[str, list[dict]] = {}
+        for report_id, messages in batch:
+            by_report.setdefault(report_id, []).extend(messages)
+        try:
+            with _chats_lock():
+                for report_id, messages in by_report.items():
+                    _append_messages_unlocked(report_id, messages)
+        except Exception:
+            logger.exception("Failed to save %d chat message(s)", sum(map(len, by_report.values())))
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+
+def _append_messages(report_id: str, messages: list[dict]) -> None:
+    """Queue messages to be appended to a conversation's log in the background."""
+    _write_queue.put((report_id, messages))
+
+
+def flush_chats() -> None:
+    """Block until every queued chat message is on disk."""
+    _write_queue.join()
+
+
+# Messages are written by one background thread so callers don't wait on disk
+_write_queue: "queue.Queue[tuple[str, list[dict]]]" = queue.Queue()
+threading.Thread(target=_drain_writes, name="chat-writer", daemon=True).start()
+atexit.register(flush_chats)
+
+
+def add_message(report_id: str, role: str, content: str) -> dict:
+    """Add a message to a conversation."""
+    message = _new_message(role, content)
+    _append_messages(report_id, [message])
+    return message
 
 
 def clear_conversation(report_id: str) -> bool:
     """Clear conversation history for a specific report."""
+    messages_path, meta_path = _conversation_paths(report_id)
+    flush_chats()
     with _chats_lock():
-        chats = _load_chats_unlocked()
-        if report_id in chats["conversations"]:
-            del chats["conversations"][report_id]
-            _save_chats_unlocked(chats)
-            return True
-        return False
+        _conversation_cache.pop(messages_path, None)
+        meta_path.unlink(missing_ok=True)
+        try:
+            messages_path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
 
 
 def format_report_context(report: dict) -> str:
-    """Format report data into system prompt context."""
+    """Format report data into system prompt context.
+
+    Cached per report version; every rewrite of a report bumps updated_at.
+    """
+    version = report.get("updated_at") or report.get("generated_at")
+    key = (report.get("focus_area"), version)
+    if version is not None and key in _report_context_cache:
+        return _report_context_cache[key]
+
     analysis = report.get("analysis", {})
     is_news_mode = "top_stories" in analysis
 
     if is_news_mode:
-        return _format_news_context(report, analysis)
+        context = _format_news_context(report, analysis)
     else:
-        return _format_opportunities_context(report, analysis)
+        context = _format_opportunities_context(report, analysis)
 
+    if version is not None:
+        if len(_report_context_cache) >= REPORT_CONTEXT_CACHE_SIZE:
+            # Drop the oldest entry
+            del _report_context_cache[next(iter(_report_context_cache))]
+        _report_context_cache[key] = context
+    return context
 
-def _format_opportunities_context(report: dict, analysis: dict) -> str:
-    """Format opportunities-mode report for context."""
-    # Format opportunities
-    opps = analysis.get("opportunities", [])
-    opps_text = "\n".join(
-        [
-            f"- **{o['title']}**: {o.get('description', '')[:200]}... "
-            f"(Potential: {o.get('potential', 'unknown')}, Difficulty: {o.get('difficulty', 'unknown')})"
-            for o in opps[:10]
-        ]
-    )
 
-    # Format pain points
-    pains = analysis.get("pain_points", [])
-    pains_text = "\n".join(
-        [
-            f"- **{p['problem']}**: Severity {p.get('severity', 'unknown')}, "
-            f"Current solutions: {p.get('current_solutions', 'N/A')[:100]}..."
-            for p in pains[:10]
-        ]
-    )
-
-    # Format insights
-    insights = analysis.get("market_insights", [])
-    insights_text = "\n".join([f"- {i['insight']}" for i in insights[:5]])
-
-    # Format recommended actions
-    actions = analysis.get("recommended_actions", [])
-    actions_text = "\n".join([f"- {a}" for a in actions[:5]])
+# Line and prompt templates, bound once at import instead of rebuilt per turn
+_OPPORTUNITY_LINE = "- **{}**: {}... (Potential: {}, Difficulty: {})".format
+_PAIN_LINE = "- **{}**: Severity {}, Current solutions: {}...".format
+_STORY_LINE = "- **{}** [{}]: {}...".format
+_RELEASE_LINE = "- **{}**: {}...".format
+_DISCUSSION_LINE = "- **{}**: {}... (Sentiment: {})".format
+_TOOL_LINE = "- **{}**: {} mentions, sentiment: {}".format
 
-    subreddits = report.get("subreddits_analyzed", [])
-
-    return f"""You are an intelligent assistant for the Reddar Reddit Intelligence platform. You help users understand and explore business opportunity reports extracted from Reddit discussions.
+_OPPORTUNITIES_CONTEXT = """You are an intelligent assistant for the Reddar Reddit Intelligence platform. You help users understand and explore business opportunity reports extracted from Reddit discussions.
 
-## Report: {report.get('focus_name', 'Unknown')}
-**Last Updated:** {report.get('updated_at', report.get('generated_at', 'Unknown'))[:16]}
-**Posts Analyzed:** {report.get('total_posts_analyzed', report.get('posts_analyzed', 0))}
-**Subreddits:** {', '.join(subreddits[:8])}{'...' if len(subreddits) > 8 else ''}
+## Report: {focus_name}
+**Last Updated:** {updated_at}
+**Posts Analyzed:** {posts_analyzed}
+**Subreddits:** {subreddits}
 
 ## Executive Summary
-{analysis.get('executive_summary', 'No summary available.')}
+{executive_summary}
 
-## Opportunities ({len(opps)} identified)
-{opps_text or 'None identified yet.'}
+## Opportunities ({opps_count} identified)
+{opps}
 
-## Pain Points ({len(pains)} identified)
-{pains_text or 'None identified yet.'}
+## Pain Points ({pains_count} identified)
+{pains}
 
 ## Market Insights
-{insights_text or 'None available.'}
+{insights}
 
 ## Trending Topics
-{', '.join(analysis.get('trending_topics', [])[:10]) or 'None identified.'}
+{trending}
 
 ## Recommended Actions
-{actions_text or 'None available.'}
+{actions}
 
 ---
-You have full knowledge of this report. Answer questions thoroughly, cite specific opportunities or pain points when relevant, and provide actionable business insights. If asked about something not covered in the report, acknowledge that and offer your best general guidance."""
+You have full knowledge of this report. Answer questions thoroughly, cite specific opportunities or pain points when relevant, and provide actionable business insights. If asked about something not covered in the report, acknowledge that and offer your best general guidance.""".format
 
+_NEWS_CONTEXT = """You are an intelligent assistant for the Reddar Reddit Intelligence platform. You help users understand AI, ML, and open-source news and developments extracted from Reddit discussions.
 
-def _format_news_context(report: dict, analysis: dict) -> str:
-    """Format news-mode report for context."""
-    stories = analysis.get("top_stories", [])
-    stories_text = "\n".join(
-        [
-            f"- **{s['headline']}** [{s.get('category', 'general')}]: {s.get('summary', '')[:150]}..."
-            for s in stories[:10]
-        ]
-    )
+## Report: {focus_name}
+**Last Updated:** {updated_at}
+**Posts Analyzed:** {posts_analyzed}
 
-    releases = analysis.get("notable_releases", [])
-    releases_text = "\n".join(
-        [f"- **{r['name']}**: {r.get('description', 'N/A')[:100]}..." for r in releases[:8]]
-    )
+## Executive Summary
+{executive_summary}
 
-    discussions = analysis.get("trending_discussions", [])
-    discussions_text = "\n".join(
-        [
-            f"- **{d.get('topic', 'Unknown')}**: {d.get('summary', '')[:100]}... (Sentiment: {d.get('sentiment', 'neutral')})"
-            for d in discussions[:5]
-        ]
-    )
+## Top Stories ({stories_count} found)
+{stories}
 
-    tools = analysis.get("tools_mentioned", [])
-    tools_text = "\n".join(
-        [f"- **{t['name']}**: {t.get('mentions', 'N/A')} mentions, sentiment: {t.get('sentiment', 'neutral')}" for t in tools[:10]]
-    )
+## Notable Releases ({releases_count} found)
+{releases}
 
-    takeaways = analysis.get("key_takeaways", [])
-    takeaways_text = "\n".join([f"- {t}" for t in takeaways[:5]])
+## Trending Discussions
+{discussions}
 
-    return f"""You are an intelligent assistant for the Reddar Reddit Intelligence platform. You help users understand AI, ML, and open-source news and developments extracted from Reddit discussions.
+## Tools & Projects Mentioned ({tools_count} found)
+{tools}
 
-## Report: {report.get('focus_name', 'Unknown')}
-**Last Updated:** {report.get('updated_at', report.get('generated_at', 'Unknown'))[:16]}
-**Posts Analyzed:** {report.get('total_posts_analyzed', report.get('posts_analyzed', 0))}
+## Key Takeaways
+{takeaways}
 
-## Executive Summary
-{analysis.get('executive_summary', 'No summary available.')}
+---
+You have full knowledge of this news report. Help users understand the latest developments, compare tools and models, identify trends, and provide context about the AI/ML ecosystem. Cite specific stories or releases when relevant.""".format
 
-## Top Stories ({len(stories)} found)
-{stories_text or 'None identified yet.'}
 
-## Notable Releases ({len(releases)} found)
-{releases_text or 'None identified yet.'}
+def _format_lines(line: Callable[..., str], items: list[dict], fields: tuple) -> str:
+    """Format items one per line, projecting each field into its own column first.
 
-## Trending Discussions
-{discussions_text or 'None identified yet.'}
+    fields holds (key, default, max_chars) triples; max_chars None keeps the whole value.
+    """
+    columns = []
+    for key, default, max_chars in fields:
+        column = [item.get(key, default) for item in items]
+        if max_chars is not None:
+            column = [value[:max_chars] for value in column]
+        columns.append(column)
+    return "\n".join(map(line, *columns))
 
-## Tools & Projects Mentioned ({len(tools)} found)
-{tools_text or 'None mentioned.'}
 
-## Key Takeaways
-{takeaways_text or 'None available.'}
+def _format_opportunities_context(report: dict, analysis: dict) -> str:
+    """Format opportunities-mode report for context."""
+    opps = analysis.get("opportunities", [])
+    pains = analysis.get("pain_points", [])
+    subreddits = report.get("subreddits_analyzed", [])
 
----
-You have full knowledge of this news report. Help users understand the latest developments, compare tools and models, identify trends, and provide context about the AI/ML ecosystem. Cite specific stories or releases when relevant."""
+    return _OPPORTUNITIES_CONTEXT(
+        focus_name=report.get("focus_name", "Unknown"),
+        updated_at=report.get("updated_at", report.get("generated_at", "Unknown"))[:16],
+        posts_analyzed=report.get("total_posts_analyzed", report.get("posts_analyzed", 0)),
+        subreddits=", ".join(subreddits[:8]) + ("..." if len(subreddits) > 8 else ""),
+        executive_summary=analysis.get("executive_summary", "No summary available."),
+        opps_count=len(opps),
+        opps=_format_lines(
+            _OPPORTUNITY_LINE,
+            opps[:10],
+            (
+                ("title", "", None),
+                ("description", "", 200),
+                ("potential", "unknown", None),
+                ("difficulty", "unknown", None),
+            ),
+        )
+        or "None identified yet.",
+        pains_count=len(pains),
+        pains=_format_lines(
+            _PAIN_LINE,
+            pains[:10],
+            (("problem", "", None), ("severity", "unknown", None), ("current_solutions", "N/A", 100)),
+        )
+        or "None identified yet.",
+        insights="\n".join("- " + i["insight"] for i in analysis.get("market_insights", [])[:5])
+        or "None available.",
+        trending=", ".join(analysis.get("trending_topics", [])[:10]) or "None identified.",
+        actions="\n".join("- " + a for a in analysis.get("recommended_actions", [])[:5])
+        or "None available.",
+    )
 
 
-def build_messages_for_llm(report: dict, conversation: Optional[dict], new_message: str) -> tuple[str, str]:
+def _format_news_context(report: dict, analysis: dict) -> str:
+    """Format news-mode report for context."""
+    stories = analysis.get("top_stories", [])
+    releases = analysis.get("notable_releases", [])
+    tools = analysis.get("tools_mentioned", [])
+
+    return _NEWS_CONTEXT(
+        focus_name=report.get("focus_name", "Unknown"),
+        updated_at=report.get("updated_at", report.get("generated_at", "Unknown"))[:16],
+        posts_analyzed=report.get("total_posts_analyzed", report.get("posts_analyzed", 0)),
+        executive_summary=analysis.get("executive_summary", "No summary available."),
+        stories_count=len(stories),
+        stories=_format_lines(
+            _STORY_LINE,
+            stories[:10],
+            (("headline", "", None), ("category", "general", None), ("summary", "", 150)),
+        )
+        or "None identified yet.",
+        releases_count=len(releases),
+        releases=_format_lines(
+            _RELEASE_LINE, releases[:8], (("name", "", None), ("description", "N/A", 100))
+        )
+        or "None identified yet.",
+        discussions=_format_lines(
+            _DISCUSSION_LINE,
+            analysis.get("trending_discussions", [])[:5],
+            (("topic", "Unknown", None), ("summary", "", 100), ("sentiment", "neutral", None)),
+        )
+        or "None identified yet.",
+        tools_count=len(tools),
+        tools=_format_lines(
+            _TOOL_LINE,
+            tools[:10],
+            (("name", "", None), ("mentions", "N/A", None), ("sentiment", "neutral", None)),
+        )
+        or "None mentioned.",
+        takeaways="\n".join("- " + t for t in analysis.get("key_takeaways", [])[:5])
+        or "None available.",
+    )
+
+
+def select_history(messages: list[dict], max_tokens: int = DEFAULT_HISTORY_TOKENS) -> list[dict]:
+    """Get the most recent messages that fit in an approximate token budget."""
+    budget = max_tokens * CHARS_PER_TOKEN
+    start = len(messages)
+    while start > 0:
+        budget -= len(messages[start - 1]["content"])
+        if budget < 0:
+            break
+        start -= 1
+    return messages[start:]
+
+
+def build_messages_for_llm(
+    report: dict,
+    conversation: Optional[dict],
+    new_message: str,
+    max_history_tokens: int = DEFAULT_HISTORY_TOKENS,
+) -> tuple[str, str]:
     """Build system prompt and user prompt for LLM call.
 
     Returns (system_prompt, user_prompt) tuple.
@@ -238,8 +472,9 @@ def build_messages_for_llm(report: dict, conversation: Optional[dict], new_messa
     # Build conversation history as part of user prompt
     history_parts = []
     if conversation and conversation.get("messages"):
-        # Keep last 20 messages to stay within context limits
-        recent_messages = conversation["messages"][-20:]
+        # Newest messages first until the budget runs out, so one huge paste
+        # can't push the prompt past the model's context
+        recent_messages = select_history(conversation["messages"], max_history_tokens)
         for msg in recent_messages:
             role_label = "User" if msg["role"] == "user" else "Assistant"
             history_parts.append(f"{role_label}: {msg['content']}")
@@ -263,29 +498,26 @@ def chat_with_report(
     if config is None:
         config = load_config()
 
-    # Save user message first
-    user_msg = add_message(report_id, "user", user_message)
-
-    # Get updated conversation (includes the message we just added)
     conversation = get_conversation(report_id)
-
-    # Build prompts - exclude the message we just added from history
-    # since we'll add it explicitly
-    temp_conv = {
-        "messages": conversation["messages"][:-1]  # Exclude last (current) message
-    } if conversation and len(conversation.get("messages", [])) > 1 else None
-
-    system_prompt, user_prompt = build_messages_for_llm(report, temp_conv, user_message)
-
-    # Call LLM
-    response_content, reasoning = call_llm(
-        prompt=user_prompt,
-        system_prompt=system_prompt,
-        config=config,
-        json_mode=False,
+    max_history_tokens = config.get("chat", {}).get("history_tokens", DEFAULT_HISTORY_TOKENS)
+    system_prompt, user_prompt = build_messages_for_llm(
+        report, conversation, user_message, max_history_tokens
     )
 
-    # Save assistant response
-    assistant_msg = add_message(report_id, "assistant", response_content)
+    # Both sides of the turn are saved together; the user message is kept
+    # even if the LLM call fails
+    user_msg = _new_message("user", user_message)
+    new_messages = [user_msg]
+    try:
+        response_content, reasoning = call_llm(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            config=config,
+            json_mode=False,
+        )
+        assistant_msg = _new_message("assistant", response_content)
+        new_messages.append(assistant_msg)
+    finally:
+        _append_messages(report_id, new_messages)
 
     return user_msg, assistant_msg
@@ -0,0 +1,61 @@
+"""Config loading - config.yaml compiled to a JSON cache so YAML is only parsed on edits."""
+
+import threading
+from pathlib import Path
+from typing import Optional
+
+import jsonio
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CONFIG_PATH = BASE_DIR / "config.yaml"
+# Parsed config.yaml plus the (mtime_ns, size) it was compiled from
+CONFIG_CACHE_PATH = BASE_DIR / "data" / ".config.cache.json"
+
+_config_cache: Optional[tuple[tuple[int, int], dict]] = None
+_config_lock = threading.Lock()
+
+
+def _compile_config(key: tuple[int, int]) -> dict:
+    """Parse config.yaml and refresh the JSON cache, or reuse the cache if it's current."""
+    try:
+        cached = jsonio.load_file(CONFIG_CACHE_PATH)
+        if tuple(cached["source"]) == key:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    # PyYAML is only needed when config.yaml has changed since it was compiled
+    import yaml
+
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(CONFIG_PATH) as f:
+        config = yaml.load(f, Loader=loader)
+
+    try:
+        CONFIG_CACHE_PATH.parent.mkdir(exist_ok=True)
+        jsonio.dump_file({"source": key, "config": config}, CONFIG_CACHE_PATH, indent=False)
+    except OSError:
+        pass  # A read-only checkout still works, it just re-parses
+    return config
+
+
+def load_config() -> dict:
+    """Load configuration from config.yaml, re-parsing only when the file changes.
+
+    Steady state is one stat() per call. A fresh process reads the compiled
+    JSON cache instead of parsing YAML.
+    """
+    global _config_cache
+    stat = CONFIG_PATH.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _config_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with _config_lock:
+        if _config_cache is not None and _config_cache[0] == key:
+            return _config_cache[1]
+        config = _compile_config(key)
+        _config_cache = (key, config)
+        return config
@@ -0,0 +1,98 @@
+"""JSON helpers - uses orjson when installed, falls back to the stdlib json module."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Files written compactly by default; set REDDAR_PRETTY_JSON=1 to indent them
+PRETTY = os.environ.get("REDDAR_PRETTY_JSON") == "1"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+def loads(data):
+    """Parse a JSON string or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: Path):
+    """Read and parse a JSON file."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_file_lazy(path: Path):
+    """Read a JSON file for picking out a few fields.
+
+    With pysimdjson installed this returns a read-only document whose objects
+    and arrays are only converted to Python values as they're accessed, so
+    unused subtrees are never materialized. Otherwise it's load_file.
+    """
+    if simdjson is not None:
+        # Parsers aren't thread-safe and own their documents, so use one per call
+        return simdjson.Parser().parse(Path(path).read_bytes())
+    return load_file(path)
+
+
+def dumps(obj, indent: bool = True, sort_keys: bool = False) -> str:
+    """Serialize an object to a JSON string."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode()
+    # Keep non-ASCII text as UTF-8 rather than \u escapes, as orjson does
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str, sort_keys=sort_keys)
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, default=str, sort_keys=sort_keys
+    )
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize an object to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return dumps(obj, indent=False).encode()
+
+
+def dump_file(obj, path: Path, indent: bool = True, fsync: bool = False) -> None:
+    """Write an object to a JSON file atomically.
+
+    The JSON is serialized up front and written to a temp file that replaces
+    the target, so readers never see a partially written file.
+    """
+    indent = indent or PRETTY
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        data = orjson.dumps(obj, default=str, option=option)
+    else:
+        data = dumps(obj, indent=indent).encode()
+
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp creates the file 0600; keep the target's usual permissions
+        os.chmod(tmp_path, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -1,13 +1,25 @@
 """Reddit Scraper - Fetches posts and comments from subreddits."""
 
-import json
+import contextlib
+import hashlib
+import os
 import random
+import tempfile
+import threading
 import time
 import httpx
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-import yaml
+from typing import Callable, Iterator, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+import jsonio
+from config import load_config
 
 
 # Rate limiting defaults
@@ -15,19 +27,243 @@ DEFAULT_DELAY_BETWEEN_REQUESTS = 3.0  # seconds
 DEFAULT_DELAY_BETWEEN_SUBREDDITS = 6.0  # seconds
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 2  # exponential backoff multiplier
+DEFAULT_MAX_WORKERS = 4  # subreddits scraped concurrently
+MAX_RETRY_AFTER = 120  # cap on a server-requested wait, seconds
+RETRY_STATUS_CODES = (429, 503)
+
+# Reddit JSON responses cached on disk; fresh entries skip the request entirely
+HTTP_CACHE_DIR = Path(__file__).parent.parent / "data" / ".http_cache"
+HTTP_CACHE_FRESH_SECONDS = 600  # when the response gives no max-age
+HTTP_CACHE_MAX_AGE = 24 * 3600
+
+# When msgspec is installed, listings are decoded straight into the few
+# fields we keep; media previews, awards etc. are skipped, never built
+if msgspec is not None:
+
+    class _RedditPost(msgspec.Struct):
+        id: Optional[str] = None
+        title: Optional[str] = None
+        selftext: str = ""
+        author: Optional[str] = None
+        ups: int = 0
+        num_comments: Optional[int] = None
+        permalink: Optional[str] = None
+        created_utc: float = 0
+        link_flair_text: Optional[str] = None
+        stickied: bool = False
+
+    class _RedditComment(msgspec.Struct):
+        id: Optional[str] = None
+        body: str = ""
+        author: Optional[str] = None
+        ups: Optional[int] = None
+
+    class _PostChild(msgspec.Struct):
+        data: _RedditPost
+        kind: str = ""
+
+    class _CommentChild(msgspec.Struct):
+        data: _RedditComment
+        kind: str = ""
+
+    class _PostListingData(msgspec.Struct):
+        children: list[_PostChild] = []
+
+    class _CommentListingData(msgspec.Struct):
+        children: list[_CommentChild] = []
+
+    class _PostListing(msgspec.Struct):
+        data: _PostListingData
+
+    class _CommentListing(msgspec.Struct):
+        data: _CommentListingData
+
+    _post_listing_decoder = msgspec.json.Decoder(_PostListing)
+    # [post listing, comment listing]; the post is only read for its comments
+    _comments_decoder = msgspec.json.Decoder(list[_CommentListing])
+
+
+def decode_posts(content: bytes):
+    """Decode a subreddit listing, keeping only the post fields we use."""
+    if msgspec is not None:
+        try:
+            return msgspec.to_builtins(_post_listing_decoder.decode(content))
+        except msgspec.ValidationError:
+            pass
+    return jsonio.loads(content)
+
+
+def decode_comments(content: bytes):
+    """Decode a comments page, keeping only the comment fields we use."""
+    if msgspec is not None:
+        try:
+            return msgspec.to_builtins(_comments_decoder.decode(content))
+        except msgspec.ValidationError:
+            pass
+    return jsonio.loads(content)
+
+
+# One keep-alive client shared by all scraper threads
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+class RateLimiter:
+    """Spaces out request start times across threads, with jitter."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self) -> None:
+        """Block until this caller's request slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval * random.uniform(0.5, 1.5)
+        time.sleep(start - now)
+
+
+class CachingTransport(httpx.BaseTransport):
+    """Transport that caches GET responses on disk and revalidates them.
+
+    Fresh entries (per Cache-Control max-age, else fallback_ttl) are served
+    without touching the network or waiting on the request's "limiters"
+    extension. Stale ones are revalidated with ETag/Last-Modified, and served
+    as-is if the server answers 429, 5xx or can't be reached.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        fallback_ttl: float = HTTP_CACHE_FRESH_SECONDS,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.fallback_ttl = fallback_ttl
+        self._transport = transport or httpx.HTTPTransport(
+            limits=httpx.Limits(max_keepalive_connections=8)
+        )
+
+    def _cache_path(self, url: httpx.URL) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(str(url).encode()).hexdigest()}.json"
+
+    def _expires_at(self, response: httpx.Response) -> Optional[float]:
+        """Get when a response goes stale, or None if it must not be stored."""
+        cache_control = response.headers.get("cache-control", "").lower()
+        if "no-store" in cache_control:
+            return None
+        ttl = self.fallback_ttl
+        for directive in cache_control.split(","):
+            name, _, value = directive.strip().partition("=")
+            if name == "max-age" and value.isdigit():
+                ttl = int(value)
+        return time.time() + ttl
+
+    def _cached_response(self, entry: dict, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json", "x-reddar-cache": "hit"},
+            content=entry["body"].encode(),
+            request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self._transport.handle_request(request)
+
+        cache_path = self._cache_path(request.url)
+        try:
+            entry = jsonio.load_file(cache_path)
+        except (OSError, ValueError):
+            # Missing, pruned by a concurrent scrape, or corrupt - a cache miss
+            entry = None
+        if entry and time.time() < entry.get("expires_at", 0):
+            return self._cached_response(entry, request)
+
+        if entry and entry.get("etag"):
+            request.headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        for limiter in request.extensions.get("limiters", ()):
+            limiter.wait()
+
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.TransportError:
+            if entry:
+                return self._cached_response(entry, request)
+            raise
+
+        if entry and (response.status_code == 429 or response.status_code >= 500):
+            # stale-if-error: an old listing beats none
+            response.close()
+            return self._cached_response(entry, request)
+
+        if response.status_code == 304 and entry:
+            response.close()
+            expires_at = self._expires_at(response)
+            if expires_at is not None:
+                entry["expires_at"] = expires_at
+                jsonio.dump_file(entry, cache_path, indent=False)
+            return self._cached_response(entry, request)
+
+        if response.status_code == 200:
+            body = response.read()
+            expires_at = self._expires_at(response)
+            if expires_at is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                jsonio.dump_file(
+                    {
+                        "etag": response.headers.get("etag"),
+                        "last_modified": response.headers.get("last-modified"),
+                        "expires_at": expires_at,
+                        "body": body.decode(),
+                    },
+                    cache_path,
+                    indent=False,
+                )
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
 
 
-def load_config() -> dict:
-    """Load configuration from config.yaml."""
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+def get_http_client() -> httpx.Client:
+    """Get the shared pooled HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                transport=CachingTransport(HTTP_CACHE_DIR),
+                timeout=30,
+                follow_redirects=True,
+            )
+        return _client
+
 
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Get the wait requested by a Retry-After header, if it gives seconds."""
+    try:
+        return min(float(response.headers["Retry-After"]), MAX_RETRY_AFTER)
+    except (KeyError, ValueError):
+        return None
 
-def rate_limit_delay(base_delay: float = DEFAULT_DELAY_BETWEEN_REQUESTS) -> None:
-    """Sleep with jitter to avoid predictable request patterns."""
-    jitter = random.uniform(0.5, 1.5)
-    time.sleep(base_delay * jitter)
+
+def prune_http_cache(max_age: float = HTTP_CACHE_MAX_AGE) -> None:
+    """Delete cached responses not refreshed within max_age seconds."""
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(HTTP_CACHE_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        # A concurrent scrape (CLI or dashboard) may be pruning the same files
+        with contextlib.suppress(FileNotFoundError):
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
 
 
 def fetch_with_retry(
@@ -35,27 +271,38 @@ def fetch_with_retry(
     headers: dict,
     params: dict,
     max_retries: int = MAX_RETRIES,
+    limiters: tuple = (),
+    decode: Callable[[bytes], object] = jsonio.loads,
 ) -> Optional[dict]:
-    """Fetch URL with exponential backoff retry on rate limits."""
+    """Fetch URL with exponential backoff retry on rate limits.
 
+    limiters are waited on only when the request actually goes to Reddit,
+    not when the client's cache answers it.
+    """
     for attempt in range(max_retries + 1):
         try:
-            response = httpx.get(url, headers=headers, params=params, timeout=30, follow_redirects=True)
+            response = get_http_client().get(
+                url, headers=headers, params=params, extensions={"limiters": limiters}
+            )
 
-            # Handle rate limiting
-            if response.status_code == 429:
+            # Handle rate limiting and temporary outages
+            if response.status_code in RETRY_STATUS_CODES:
+                status = response.status_code
                 if attempt < max_retries:
-                    # Exponential backoff with jitter
-                    wait_time = (BACKOFF_FACTOR ** attempt) * 10 + random.uniform(1, 5)
-                    print(f"  Rate limited (429). Waiting {wait_time:.1f}s before retry {attempt + 1}/{max_retries}...")
+                    # Honor Retry-After, else exponential backoff; jitter either way
+                    wait_time = retry_after_seconds(response)
+                    if wait_time is None:
+                        wait_time = (BACKOFF_FACTOR ** attempt) * 10
+                    wait_time += random.uniform(0, 1)
+                    print(f"  Rate limited ({status}). Waiting {wait_time:.1f}s before retry {attempt + 1}/{max_retries}...")
                     time.sleep(wait_time)
                     continue
                 else:
-                    print(f"  Rate limited (429). Max retries exceeded, skipping.")
+                    print(f"  Rate limited ({status}). Max retries exceeded, skipping.")
                     return None
 
             response.raise_for_status()
-            return response.json()
+            return decode(response.content)
 
         except httpx.HTTPStatusError as e:
             print(f"  HTTP error: {e}")
@@ -68,7 +315,11 @@ def fetch_with_retry(
 
 
 def fetch_subreddit(
-    subreddit: str, limit: int = 25, min_upvotes: int = 5, user_agent: str = "RedditIntel/1.0"
+    subreddit: str,
+    limit: int = 25,
+    min_upvotes: int = 5,
+    user_agent: str = "RedditIntel/1.0",
+    limiters: tuple = (),
 ) -> list[dict]:
     """Fetch posts from a subreddit using Reddit's JSON API."""
 
@@ -76,7 +327,7 @@ def fetch_subreddit(
     headers = {"User-Agent": user_agent}
     params = {"limit": min(limit * 2, 100)}  # Fetch extra to filter
 
-    data = fetch_with_retry(url, headers, params)
+    data = fetch_with_retry(url, headers, params, limiters=limiters, decode=decode_posts)
     if data is None:
         print(f"  Failed to fetch r/{subreddit}")
         return []
@@ -118,7 +369,11 @@ def fetch_subreddit(
 
 
 def fetch_comments(
-    subreddit: str, post_id: str, max_comments: int = 10, user_agent: str = "RedditIntel/1.0"
+    subreddit: str,
+    post_id: str,
+    max_comments: int = 10,
+    user_agent: str = "RedditIntel/1.0",
+    limiters: tuple = (),
 ) -> list[dict]:
     """Fetch top comments for a post."""
 
@@ -126,7 +381,7 @@ def fetch_comments(
     headers = {"User-Agent": user_agent}
     params = {"limit": max_comments, "sort": "top"}
 
-    data = fetch_with_retry(url, headers, params)
+    data = fetch_with_retry(url, headers, params, limiters=limiters, decode=decode_comments)
     if data is None:
         return []
 
@@ -148,8 +403,10 @@ def fetch_comments(
     return comments
 
 
-def scrape_focus_area(focus_area: str, config: Optional[dict] = None) -> dict:
-    """Scrape all subreddits for a focus area."""
+def scrape_focus_area_iter(
+    focus_area: str, config: Optional[dict] = None
+) -> Iterator[tuple[str, list[dict]]]:
+    """Scrape a focus area's subreddits concurrently, yielding (subreddit, posts)."""
 
     if config is None:
         config = load_config()
@@ -167,59 +424,197 @@ def scrape_focus_area(focus_area: str, config: Optional[dict] = None) -> dict:
     delay_between_requests = scraper_config.get("delay_between_requests", DEFAULT_DELAY_BETWEEN_REQUESTS)
     delay_between_subreddits = scraper_config.get("delay_between_subreddits", DEFAULT_DELAY_BETWEEN_SUBREDDITS)
 
-    all_posts = []
-    total_subreddits = len(focus_config["subreddits"])
+    max_workers = scraper_config.get("max_workers", DEFAULT_MAX_WORKERS)
+
+    prune_http_cache()
+
+    # Shared across workers so concurrency never raises the overall request rate
+    request_limiter = RateLimiter(delay_between_requests)
+    listing_limiter = RateLimiter(delay_between_subreddits)
+
+    subreddits = focus_config["subreddits"]
+    total_subreddits = len(subreddits)
 
-    for idx, subreddit in enumerate(focus_config["subreddits"], 1):
+    def scrape_one(idx: int, subreddit: str) -> list[dict]:
         print(f"Scraping r/{subreddit}... ({idx}/{total_subreddits})")
         posts = fetch_subreddit(
-            subreddit, limit=posts_per_sub, min_upvotes=min_upvotes, user_agent=user_agent
+            subreddit,
+            limit=posts_per_sub,
+            min_upvotes=min_upvotes,
+            user_agent=user_agent,
+            limiters=(listing_limiter, request_limiter),
         )
 
         if include_comments and posts:
-            print(f"  Fetching comments for {len(posts)} posts...")
-            for post in posts:
-                # Rate limit between comment fetches
-                rate_limit_delay(delay_between_requests)
-                post["comments"] = fetch_comments(
-                    subreddit, post["id"], max_comments=max_comments, user_agent=user_agent
+            print(f"  Fetching comments for {len(posts)} posts from r/{subreddit}...")
+
+            def fetch_post_comments(post: dict) -> list[dict]:
+                return fetch_comments(
+                    subreddit,
+                    post["id"],
+                    max_comments=max_comments,
+                    user_agent=user_agent,
+                    limiters=(request_limiter,),
                 )
 
-        all_posts.extend(posts)
+            for post, comments in zip(posts, comment_executor.map(fetch_post_comments, posts)):
+                post["comments"] = comments
+
         print(f"  Got {len(posts)} posts from r/{subreddit}")
+        return posts
+
+    # Comment fetches get their own pool so a focus area with fewer subreddits
+    # than workers still keeps every worker busy; the limiter caps the rate
+    comment_executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+
+    # Yield subreddits as they finish, not in config order
+    with comment_executor, ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, total_subreddits))
+    ) as executor:
+        futures = {
+            executor.submit(scrape_one, idx, subreddit): subreddit
+            for idx, subreddit in enumerate(subreddits, 1)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
 
-        # Rate limit between subreddits (longer delay)
-        if idx < total_subreddits:
-            rate_limit_delay(delay_between_subreddits)
 
-    result = {
+def build_scrape_data(focus_area: str, focus_config: dict, posts: list[dict]) -> dict:
+    """Build the scrape data envelope for a focus area."""
+    return {
         "focus_area": focus_area,
         "focus_name": focus_config["name"],
         "focus_description": focus_config["description"],
         "keywords": focus_config.get("keywords", []),
+        "mode": focus_config.get("mode", "opportunities"),
         "scraped_at": datetime.now(timezone.utc).isoformat(),
         "subreddits": focus_config["subreddits"],
-        "total_posts": len(all_posts),
-        "posts": all_posts,
+        "total_posts": len(posts),
+        "posts": posts,
     }
 
-    return result
 
+def scrape_focus_area(focus_area: str, config: Optional[dict] = None) -> dict:
+    """Scrape all subreddits for a focus area."""
 
-def save_scrape_data(data: dict, output_dir: Optional[Path] = None) -> Path:
-    """Save scraped data to a JSON file."""
+    if config is None:
+        config = load_config()
+
+    focus_config = config["focus_areas"].get(focus_area)
+    if not focus_config:
+        raise ValueError(f"Unknown focus area: {focus_area}")
+
+    posts_by_subreddit = dict(scrape_focus_area_iter(focus_area, config))
+
+    # Keep config order so scrape files are stable between runs
+    all_posts = []
+    for subreddit in focus_config["subreddits"]:
+        all_posts.extend(posts_by_subreddit.get(subreddit, []))
+
+    return build_scrape_data(focus_area, focus_config, all_posts)
+
+
+def scrape_output_path(
+    focus_area: str, scraped_at: str, output_dir: Optional[Path] = None
+) -> Path:
+    """Get the scrape file path for a focus area, named after its scraped_at time."""
 
     if output_dir is None:
         output_dir = Path(__file__).parent.parent / "data"
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"scrape_{data['focus_area']}_{timestamp}.json"
-    output_path = output_dir / filename
+    # Reuse the envelope's clock reading so the name and scraped_at agree
+    timestamp = datetime.fromisoformat(scraped_at).astimezone().strftime("%Y%m%d_%H%M%S")
+    return output_dir / f"scrape_{focus_area}_{timestamp}.json"
+
+
+class ScrapeFileWriter:
+    """Write a scrape file incrementally, one post at a time.
+
+    The envelope goes out first and each post is serialized as it arrives, so
+    the file never has to be built in memory. Posts go to a temp file that
+    replaces the target on close, as with jsonio.dump_file.
+    """
+
+    def __init__(self, envelope: dict, output_dir: Optional[Path] = None):
+        self.path = scrape_output_path(envelope["focus_area"], envelope["scraped_at"], output_dir)
+        self.total_posts = 0
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        os.chmod(self._tmp_path, 0o644)
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self._closed = False
+        header = {k: v for k, v in envelope.items() if k not in ("posts", "total_posts")}
+        # Reopen the serialized envelope to append the posts array
+        self._file.write(jsonio.dumps(header, indent=False)[:-1] + ',"posts":[')
+
+    def write_posts(self, posts: list[dict]) -> None:
+        """Append posts to the file."""
+        for post in posts:
+            if self.total_posts:
+                self._file.write(",")
+            self._file.write(jsonio.dumps(post, indent=False))
+            self.total_posts += 1
+
+    def close(self) -> Path:
+        """Finish the file and move it into place."""
+        if self._closed:
+            return self.path
+        self._closed = True
+        self._file.write(f'],"total_posts":{self.total_posts}}}')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        print(f"Saved scrape data to {self.path}")
+        return self.path
+
+    def abort(self) -> None:
+        """Discard a partially written file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+    def __enter__(self) -> "ScrapeFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def scrape_focus_area_to_file(
+    focus_area: str, config: Optional[dict] = None, output_dir: Optional[Path] = None
+) -> tuple[Path, int]:
+    """Scrape a focus area straight to disk, holding one subreddit's posts at a time.
+
+    Posts are written in completion order. Returns (path, total_posts).
+    """
+
+    if config is None:
+        config = load_config()
+
+    focus_config = config["focus_areas"].get(focus_area)
+    if not focus_config:
+        raise ValueError(f"Unknown focus area: {focus_area}")
+
+    envelope = build_scrape_data(focus_area, focus_config, [])
+    with ScrapeFileWriter(envelope, output_dir) as writer:
+        for _, posts in scrape_focus_area_iter(focus_area, config):
+            writer.write_posts(posts)
+    return writer.path, writer.total_posts
+
+
+def save_scrape_data(data: dict, output_dir: Optional[Path] = None) -> Path:
+    """Save scraped data to a JSON file."""
+
+    output_path = scrape_output_path(data["focus_area"], data["scraped_at"], output_dir)
 
-    with open(output_path, "w") as f:
-        json.dump(data, f, indent=2)
+    jsonio.dump_file(data, output_path, indent=False)
 
     print(f"Saved scrape data to {output_path}")
     return output_path
@@ -248,6 +643,5 @@ if __name__ == "__main__":
     focus = sys.argv[1] if len(sys.argv) > 1 else "saas_opportunities"
 
     print(f"Scraping focus area: {focus}")
-    data = scrape_focus_area(focus)
-    save_scrape_data(data)
-    print(f"Done! Scraped {data['total_posts']} posts.")
+    _, total_posts = scrape_focus_area_to_file(focus)
+    print(f"Done! Scraped {total_posts} posts.")
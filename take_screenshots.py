@@ -1,9 +1,82 @@
 #!/usr/bin/env python3
 """Take screenshots of the Reddar dashboard for README."""
 
-import time
+import asyncio
 from pathlib import Path
-from playwright.sync_api import sync_playwright
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+
+VIEWPORT = {"width": 1280, "height": 900}
+NETWORK_IDLE_TIMEOUT_MS = 5000
+
+SCREENSHOTS = [
+    ("dashboard.png", "/"),
+    ("run-agent.png", "/run"),
+    ("usage.png", "/usage"),
+]
+
+
+async def wait_for_page(page) -> None:
+    """Wait for a page's JS and fonts to settle."""
+    try:
+        # Cap the idle wait so a polling page can't stall the capture
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass
+    await page.wait_for_function("document.fonts.status === 'loaded'")
+
+
+async def capture(browser, base_url: str, path: str, screenshots_dir: Path, filename: str) -> None:
+    """Capture a single page in its own browser context."""
+    url = f"{base_url}{path}"
+    print(f"Capturing {filename} from {url}...")
+
+    context = await browser.new_context(viewport=VIEWPORT)
+    page = await context.new_page()
+    await page.goto(url, wait_until="domcontentloaded")
+    await wait_for_page(page)
+    await page.screenshot(path=screenshots_dir / filename, full_page=True)
+    await context.close()
+    print(f"  Saved {filename}")
+
+
+async def capture_report(browser, base_url: str, screenshots_dir: Path) -> None:
+    """Capture the first report linked from the dashboard, if any."""
+    context = await browser.new_context(viewport=VIEWPORT)
+    page = await context.new_page()
+    await page.goto(base_url, wait_until="domcontentloaded")
+    await wait_for_page(page)
+
+    # Try to find a report link
+    report_link = await page.query_selector('a[href^="/report/"]')
+    if report_link:
+        report_url = await report_link.get_attribute("href")
+        print(f"Capturing report.png from {report_url}...")
+        await page.goto(f"{base_url}{report_url}", wait_until="domcontentloaded")
+        await wait_for_page(page)
+        await page.screenshot(path=screenshots_dir / "report.png", full_page=True)
+        print("  Saved report.png")
+    else:
+        print("  No report found - skipping report.png")
+
+    await context.close()
+
+
+async def capture_all(base_url: str, screenshots_dir: Path) -> None:
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+
+        # Pages load concurrently - total time is the slowest page, not the sum
+        await asyncio.gather(
+            *(
+                capture(browser, base_url, path, screenshots_dir, filename)
+                for filename, path in SCREENSHOTS
+            ),
+            capture_report(browser, base_url, screenshots_dir),
+        )
+
+        await browser.close()
 
 
 def take_screenshots(base_url: str = "http://localhost:8501"):
@@ -12,41 +85,7 @@ def take_screenshots(base_url: str = "http://localhost:8501"):
     screenshots_dir = Path(__file__).parent / "screenshots"
     screenshots_dir.mkdir(exist_ok=True)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page(viewport={"width": 1280, "height": 900})
-
-        screenshots = [
-            ("dashboard.png", "/", 1),
-            ("run-agent.png", "/run", 1),
-            ("usage.png", "/usage", 1),
-        ]
-
-        for filename, path, wait_secs in screenshots:
-            url = f"{base_url}{path}"
-            print(f"Capturing {filename} from {url}...")
-            page.goto(url)
-            time.sleep(wait_secs)  # Wait for JS to load
-            page.screenshot(path=screenshots_dir / filename, full_page=True)
-            print(f"  Saved {filename}")
-
-        # For report, we need to find an existing report
-        page.goto(base_url)
-        time.sleep(1)
-
-        # Try to find a report link
-        report_link = page.query_selector('a[href^="/report/"]')
-        if report_link:
-            report_url = report_link.get_attribute("href")
-            print(f"Capturing report.png from {report_url}...")
-            page.goto(f"{base_url}{report_url}")
-            time.sleep(1)
-            page.screenshot(path=screenshots_dir / "report.png", full_page=True)
-            print("  Saved report.png")
-        else:
-            print("  No report found - skipping report.png")
-
-        browser.close()
+    asyncio.run(capture_all(base_url, screenshots_dir))
 
     print(f"\nScreenshots saved to {screenshots_dir}")
 
@@ -1,86 +1,159 @@
 #!/usr/bin/env python3
 """Reddit Intelligence Dashboard - Web interface for viewing reports."""
 
-import json
+import logging
+import os
+import re
 import sys
-import time
 import threading
 import queue
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request, Response
-import yaml
+from typing import Optional
+from flask import Flask, render_template, request, Response, send_from_directory
+from werkzeug.exceptions import NotFound
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import jsonio
+from config import load_config
+from analyzer import get_summary_path, save_report_summary
 from chat import get_conversation, clear_conversation, chat_with_report
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
 # Paths
-BASE_DIR = Path(__file__).parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent
 REPORTS_DIR = BASE_DIR / "reports"
 DATA_DIR = BASE_DIR / "data"
-CONFIG_PATH = BASE_DIR / "config.yaml"
 
+# Report files are report_<focus area>.json; anything else in reports/ (like
+# the .summary.json sidecars) isn't a report
+REPORT_ID_RE = re.compile(r"report_[\w-]+")
 
-def load_config() -> dict:
-    """Load configuration."""
-    with open(CONFIG_PATH) as f:
-        return yaml.safe_load(f)
+# Usage log entries returned by /api/token-usage unless ?limit= says otherwise
+DEFAULT_USAGE_LOG_LIMIT = 100
+
+# Report summaries read in parallel when many changed at once
+REPORT_LOAD_WORKERS = 16
+
+# Dashboard scans fetch this many subreddits at once, starting requests this far apart
+SCAN_SCRAPE_WORKERS = 4
+SCAN_REQUEST_DELAY = 1.0
+
+
+# report path -> (summary file (mtime_ns, size), summary), plus the sorted list as of the
+# reports directory's last seen (mtime_ns, size)
+_report_summaries: dict[Path, tuple[tuple[int, int], dict]] = {}
+_reports_dir_key: Optional[tuple[int, int]] = None
+_reports_sorted: list[dict] = []
+_reports_lock = threading.Lock()
+# /api/stats body as of that same directory key
+_stats_cache: Optional[tuple[tuple[int, int], bytes]] = None
+_usage_cache: Optional[tuple[tuple[int, int], dict]] = None
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """Build a JSON response, encoded with orjson when it's installed."""
+    return Response(jsonio.dumps_bytes(obj), status=status, mimetype="application/json")
 
 
 def get_reports() -> list[dict]:
-    """Get all reports (one per focus area), sorted by last update."""
-    reports = []
+    """Get all reports (one per focus area), sorted by last update.
 
-    for path in REPORTS_DIR.glob("report_*.json"):
-        try:
-            with open(path) as f:
-                data = json.load(f)
+    Listings come from each report's small .summary.json sidecar, cached until
+    it changes. Reports are always replaced atomically, which bumps the
+    directory's mtime, so an unchanged directory means nothing needs checking.
+    """
+    return get_reports_versioned()[1]
 
-            # Extract summary info
-            analysis = data.get("analysis", {})
 
-            # Handle both old and new report formats
-            updated_at = data.get("updated_at") or data.get("generated_at", "")
-            created_at = data.get("created_at") or data.get("generated_at", "")
-            total_posts = data.get("total_posts_analyzed") or data.get("posts_analyzed", 0)
-            total_scans = data.get("total_scans", 1)
+def get_reports_versioned() -> tuple[Optional[tuple[int, int]], list[dict]]:
+    """Get (version, reports); version is the reports directory's (mtime_ns, size)."""
+    with _reports_lock:
+        reports = _get_reports_unlocked()
+        return _reports_dir_key, reports
 
-            reports.append(
-                {
-                    "id": data.get("id", path.stem),
-                    "focus_area": data.get("focus_area", "unknown"),
-                    "focus_name": data.get("focus_name", "Unknown"),
-                    "created_at": created_at,
-                    "updated_at": updated_at,
-                    "total_scans": total_scans,
-                    "posts_analyzed": total_posts,
-                    "opportunities_count": len(analysis.get("opportunities", [])),
-                    "pain_points_count": len(analysis.get("pain_points", [])),
-                    "executive_summary": analysis.get("executive_summary", ""),
-                    "scan_history": data.get("scan_history", []),
-                    "file": str(path),
-                }
-            )
-        except Exception as e:
+
+def _get_reports_unlocked() -> list[dict]:
+    """Refresh and return the report listing (caller must hold _reports_lock)."""
+    global _reports_dir_key, _reports_sorted
+    try:
+        stat = REPORTS_DIR.stat()
+    except FileNotFoundError:
+        _report_summaries.clear()
+        _reports_dir_key, _reports_sorted = None, []
+        return []
+    dir_key = (stat.st_mtime_ns, stat.st_size)
+    if dir_key == _reports_dir_key:
+        return list(_reports_sorted)
+
+    with os.scandir(REPORTS_DIR) as it:
+        entries = {entry.name: entry for entry in it if entry.name.startswith("report_")}
+    seen = set()
+    to_load = []  # (report path, summary path or None to backfill, summary file key)
+    for name, entry in entries.items():
+        if not name.endswith(".json") or name.endswith(".summary.json"):
+            continue
+        path = Path(entry.path)
+        seen.add(path)
+        summary_entry = entries.get(get_summary_path(path).name)
+        try:
+            report_mtime = entry.stat().st_mtime_ns
+            if summary_entry is None or summary_entry.stat().st_mtime_ns < report_mtime:
+                to_load.append((path, None, None))
+                continue
+            stat = summary_entry.stat()
+            file_key = (stat.st_mtime_ns, stat.st_size)
+            cached = _report_summaries.get(path)
+            if cached is None or cached[0] != file_key:
+                to_load.append((path, Path(summary_entry.path), file_key))
+        except OSError as e:
+            _report_summaries.pop(path, None)
             print(f"Error loading {path}: {e}")
 
+    def load_summary(path: Path, summary_path: Optional[Path]) -> dict:
+        if summary_path is None:
+            # Saved before sidecars existed (or by hand); backfill once, without
+            # materializing the posts and history the summary doesn't need
+            return save_report_summary(jsonio.load_file_lazy(path), path)
+        return jsonio.load_file(summary_path)
+
+    if to_load:
+        # File reads and orjson parsing release the GIL, so loads overlap
+        with ThreadPoolExecutor(max_workers=min(REPORT_LOAD_WORKERS, len(to_load))) as executor:
+            futures = [
+                executor.submit(load_summary, path, summary_path)
+                for path, summary_path, _ in to_load
+            ]
+        for (path, _, file_key), future in zip(to_load, futures):
+            try:
+                _report_summaries[path] = (file_key, {**future.result(), "file": str(path)})
+            except Exception as e:
+                _report_summaries.pop(path, None)
+                print(f"Error loading {path}: {e}")
+
+    for path in _report_summaries.keys() - seen:
+        del _report_summaries[path]
+
     # Sort by last update, newest first
+    reports = [summary for _, summary in _report_summaries.values()]
     reports.sort(key=lambda x: x["updated_at"], reverse=True)
-    return reports
+    _reports_dir_key, _reports_sorted = dir_key, reports
+    return list(reports)
 
 
 def get_report(report_id: str) -> dict | None:
     """Get a specific report by ID."""
+    if not REPORT_ID_RE.fullmatch(report_id):
+        return None
     path = REPORTS_DIR / f"{report_id}.json"
     if not path.exists():
         return None
 
-    with open(path) as f:
-        return json.load(f)
+    return jsonio.load_file(path)
 
 
 @app.route("/")
@@ -110,47 +183,79 @@ def view_report(report_id: str):
     return render_template("report.html", report=report)
 
 
+def make_etag(key: tuple[int, int]) -> str:
+    """Build an ETag from a file or directory's (mtime_ns, size)."""
+    return f"{key[0]:x}-{key[1]:x}"
+
+
+def conditional_response(etag: Optional[str], build) -> Response:
+    """Answer 304 if the client already has this ETag, else build the response."""
+    if etag is not None and request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    if etag is not None:
+        response.set_etag(etag)
+    return response
+
+
 @app.route("/api/reports")
 def api_reports():
     """API: Get all reports."""
-    return jsonify(get_reports())
+    version, reports = get_reports_versioned()
+    etag = make_etag(version) if version else None
+    return conditional_response(etag, lambda: json_response(reports))
 
 
 @app.route("/api/report/<report_id>")
 def api_report(report_id: str):
     """API: Get a specific report."""
-    report = get_report(report_id)
-    if not report:
-        return jsonify({"error": "Not found"}), 404
-    return jsonify(report)
+    if not REPORT_ID_RE.fullmatch(report_id):
+        return json_response({"error": "Not found"}, 404)
+    try:
+        # Reports are already JSON on disk, so send the file as-is instead of
+        # parsing and re-encoding it; Werkzeug handles ETag, 304 and Range
+        return send_from_directory(REPORTS_DIR, f"{report_id}.json", mimetype="application/json")
+    except NotFound:
+        return json_response({"error": "Not found"}, 404)
 
 
 @app.route("/api/focus-areas")
 def api_focus_areas():
     """API: Get available focus areas."""
     config = load_config()
-    return jsonify(config.get("focus_areas", {}))
+    return json_response(config.get("focus_areas", {}))
 
 
 @app.route("/api/stats")
 def api_stats():
-    """API: Get overall statistics."""
-    reports = get_reports()
-
-    total_opportunities = sum(r["opportunities_count"] for r in reports)
-    total_pain_points = sum(r["pain_points_count"] for r in reports)
-    total_posts = sum(r["posts_analyzed"] for r in reports)
-
-    # Group by focus area
+    """API: Get overall statistics.
+
+    The encoded body is kept until get_reports sees the reports directory change.
+    """
+    global _stats_cache
+    version, reports = get_reports_versioned()
+    etag = make_etag(version) if version else None
+    if _stats_cache is not None and _stats_cache[0] == version:
+        body = _stats_cache[1]
+        return conditional_response(etag, lambda: Response(body, mimetype="application/json"))
+
+    # Totals and the per-focus-area grouping in a single pass
+    total_opportunities = total_pain_points = total_posts = 0
     by_focus = {}
     for r in reports:
-        fa = r["focus_area"]
-        if fa not in by_focus:
-            by_focus[fa] = {"count": 0, "opportunities": 0}
-        by_focus[fa]["count"] += 1
-        by_focus[fa]["opportunities"] += r["opportunities_count"]
-
-    return jsonify(
+        opportunities = r["opportunities_count"]
+        total_opportunities += opportunities
+        total_pain_points += r["pain_points_count"]
+        total_posts += r["posts_analyzed"]
+
+        focus = by_focus.get(r["focus_area"])
+        if focus is None:
+            focus = by_focus[r["focus_area"]] = {"count": 0, "opportunities": 0}
+        focus["count"] += 1
+        focus["opportunities"] += opportunities
+
+    body = jsonio.dumps_bytes(
         {
             "total_reports": len(reports),
             "total_opportunities": total_opportunities,
@@ -160,16 +265,38 @@ def api_stats():
             "latest_report": reports[0] if reports else None,
         }
     )
+    if version is not None:
+        _stats_cache = (version, body)
+    return conditional_response(etag, lambda: Response(body, mimetype="application/json"))
+
+
+def load_usage_file(path: Path) -> dict:
+    """Load usage.json, re-parsing only when the file changes."""
+    global _usage_cache
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _usage_cache is not None and _usage_cache[0] == key:
+        return _usage_cache[1]
+
+    data = jsonio.load_file(path)
+    _usage_cache = (key, data)
+    return data
 
 
 @app.route("/api/token-usage")
 def api_token_usage():
-    """API: Get token usage from local usage tracking file."""
+    """API: Get token usage from local usage tracking file.
+
+    recent_logs is newest first; ?limit= and ?offset= page through it
+    (limit=0 returns just the totals).
+    """
     usage_file = DATA_DIR / "usage.json"
+    limit = request.args.get("limit", DEFAULT_USAGE_LOG_LIMIT, type=int)
+    offset = max(0, request.args.get("offset", 0, type=int))
 
     try:
         if not usage_file.exists():
-            return jsonify(
+            return json_response(
                 {
                     "connected": True,
                     "total_requests": 0,
@@ -177,12 +304,12 @@ def api_token_usage():
                     "prompt_tokens": 0,
                     "completion_tokens": 0,
                     "avg_latency_ms": 0,
+                    "total_logs": 0,
                     "recent_logs": [],
                 }
             )
 
-        with open(usage_file) as f:
-            data = json.load(f)
+        data = load_usage_file(usage_file)
 
         totals = data.get("totals", {})
         requests = data.get("requests", [])
@@ -191,9 +318,9 @@ def api_token_usage():
         total_latency = sum(r.get("latency_ms", 0) for r in requests)
         avg_latency = total_latency / len(requests) if requests else 0
 
-        # Format recent logs (return all, let frontend limit if needed)
+        # Only the requested page is formatted
         recent_logs = []
-        for i, req in enumerate(requests):
+        for i, req in enumerate(requests[offset : offset + max(0, limit)], offset):
             recent_logs.append(
                 {
                     "id": req.get("id", f"{i + 1:03d}"),
@@ -207,10 +334,11 @@ def api_token_usage():
                     "messages": req.get("messages", []),
                     "response": req.get("response", ""),
                     "reasoning": req.get("reasoning", ""),
+                    "payload_ref": req.get("payload_ref"),
                 }
             )
 
-        return jsonify(
+        return json_response(
             {
                 "connected": True,
                 "total_requests": totals.get("requests", 0),
@@ -218,12 +346,13 @@ def api_token_usage():
                 "prompt_tokens": totals.get("prompt_tokens", 0),
                 "completion_tokens": totals.get("completion_tokens", 0),
                 "avg_latency_ms": round(avg_latency),
+                "total_logs": len(requests),
                 "recent_logs": recent_logs,
             }
         )
 
     except Exception as e:
-        return jsonify(
+        return json_response(
             {
                 "connected": False,
                 "error": str(e),
@@ -237,18 +366,29 @@ def api_token_usage():
         )
 
 
+@app.route("/api/token-usage/payload/<ref>")
+def api_token_usage_payload(ref: str):
+    """API: Get the prompt and response of a logged request."""
+    from analyzer import load_usage_payload
+
+    payload = load_usage_payload(ref)
+    if payload is None:
+        return json_response({"error": "Payload not found"}, 404)
+    return json_response(payload)
+
+
 @app.route("/api/chat/<report_id>", methods=["GET"])
 def api_get_chat(report_id: str):
     """API: Get chat history for a report."""
     conversation = get_conversation(report_id)
     if not conversation:
-        return jsonify({
+        return json_response({
             "report_id": report_id,
             "messages": [],
             "created_at": None,
             "updated_at": None,
         })
-    return jsonify(conversation)
+    return json_response(conversation)
 
 
 @app.route("/api/chat/<report_id>", methods=["POST"])
@@ -256,15 +396,15 @@ def api_send_chat(report_id: str):
     """API: Send a chat message and get LLM response."""
     report = get_report(report_id)
     if not report:
-        return jsonify({"error": "Report not found"}), 404
+        return json_response({"error": "Report not found"}, 404)
 
     data = request.get_json()
     if not data or not data.get("message"):
-        return jsonify({"error": "Message required"}), 400
+        return json_response({"error": "Message required"}, 400)
 
     user_message = data["message"].strip()
     if not user_message:
-        return jsonify({"error": "Message cannot be empty"}), 400
+        return json_response({"error": "Message cannot be empty"}, 400)
 
     config = load_config()
 
@@ -276,19 +416,19 @@ def api_send_chat(report_id: str):
             config=config,
         )
 
-        return jsonify({
+        return json_response({
             "user_message": user_msg,
             "assistant_message": assistant_msg,
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 
 @app.route("/api/chat/<report_id>", methods=["DELETE"])
 def api_clear_chat(report_id: str):
     """API: Clear chat history for a report."""
     success = clear_conversation(report_id)
-    return jsonify({
+    return json_response({
         "success": success,
         "message": "Chat history cleared" if success else "No chat history found",
     })
@@ -311,58 +451,71 @@ def usage_page():
 @app.route("/api/run/<focus_area>")
 def api_run_agent(focus_area: str):
     """Run agent with SSE streaming output."""
-    from scraper import scrape_focus_area, save_scrape_data
-    from analyzer import analyze_scrape_data, save_report
+    from scraper import RateLimiter, fetch_subreddit, save_scrape_data
+    from analyzer import analyze_scrape_data, flush_usage, save_report
 
-    def generate():
+    def sse(data) -> bytes:
+        return b"data: " + jsonio.dumps_bytes(data) + b"\n\n"
+
+    def run_pipeline(emit) -> None:
         try:
             config = load_config()
             focus_config = config.get("focus_areas", {}).get(focus_area)
 
             if not focus_config:
-                err = {"type": "error", "message": f"Unknown focus area: {focus_area}"}
-                yield f"data: {json.dumps(err)}\n\n"
+                emit({"type": "error", "message": f"Unknown focus area: {focus_area}"})
                 return
 
             # Step 1: Scraping
-            def sse(data):
-                return f"data: {json.dumps(data)}\n\n"
 
-            yield sse({"type": "progress", "step": 1, "percent": 0, "status": "SCRAPING REDDIT"})
+            emit({"type": "progress", "step": 1, "percent": 0, "status": "SCRAPING REDDIT"})
             focus_name = focus_config.get("name", focus_area)
-            yield sse(
+            emit(
                 {"type": "log", "message": f"Starting scan: {focus_name}", "level": "highlight"}
             )
 
             subreddits = focus_config.get("subreddits", [])
             total_subs = len(subreddits)
-            all_posts = []
-
-            for i, subreddit in enumerate(subreddits):
-                yield sse({"type": "log", "message": f"Scraping r/{subreddit}..."})
-                pct = int((i / total_subs) * 100)
-                yield sse(
-                    {
-                        "type": "progress",
-                        "step": 1,
-                        "percent": pct,
-                        "status": f"SCRAPING r/{subreddit}",
-                    }
-                )
-                yield sse({"type": "stats", "subreddits": i + 1})
-
-                # Import and use scraper functions
-                from scraper import fetch_subreddit
-
-                posts = fetch_subreddit(subreddit, limit=25, min_upvotes=5)
-                all_posts.extend(posts)
+            posts_found = 0
+
+            emit({"type": "log", "message": f"Scraping {total_subs} subreddits..."})
+
+            # Subreddits are fetched in parallel; the shared limiter keeps
+            # request starts spaced out like the old one-second sleep did
+            limiter = RateLimiter(SCAN_REQUEST_DELAY)
+            posts_by_subreddit = {}
+            with ThreadPoolExecutor(max_workers=SCAN_SCRAPE_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        fetch_subreddit, subreddit, limit=25, min_upvotes=5, limiters=(limiter,)
+                    ): subreddit
+                    for subreddit in subreddits
+                }
+                for i, future in enumerate(as_completed(futures), 1):
+                    subreddit = futures[future]
+                    posts = posts_by_subreddit[subreddit] = future.result()
+                    posts_found += len(posts)
 
-                yield sse(
-                    {"type": "log", "message": f"  Found {len(posts)} posts", "level": "success"}
-                )
-                yield sse({"type": "stats", "posts": len(all_posts)})
+                    emit(
+                        {
+                            "type": "progress",
+                            "step": 1,
+                            "percent": int(i / total_subs * 100),
+                            "status": f"SCRAPED r/{subreddit}",
+                        }
+                    )
+                    emit({"type": "stats", "subreddits": i})
+                    emit(
+                        {
+                            "type": "log",
+                            "message": f"  r/{subreddit}: found {len(posts)} posts",
+                            "level": "success",
+                        }
+                    )
+                    emit({"type": "stats", "posts": posts_found})
 
-                time.sleep(1)  # Rate limit
+            # Keep config order so scrape files are stable between runs
+            all_posts = [post for subreddit in subreddits for post in posts_by_subreddit[subreddit]]
 
             # Save scrape data
             scrape_data = {
@@ -371,7 +524,7 @@ def api_run_agent(focus_area: str):
                 "focus_description": focus_config.get("description", ""),
                 "keywords": focus_config.get("keywords", []),
                 "mode": focus_config.get("mode", "opportunities"),  # Pass mode for analysis
-                "scraped_at": datetime.now().isoformat(),
+                "scraped_at": datetime.now(timezone.utc).isoformat(),
                 "subreddits": subreddits,
                 "total_posts": len(all_posts),
                 "posts": all_posts,
@@ -379,10 +532,10 @@ def api_run_agent(focus_area: str):
             scrape_path = save_scrape_data(scrape_data)
             scrape_data["source_file"] = str(scrape_path)
 
-            yield sse(
+            emit(
                 {"type": "progress", "step": 1, "percent": 100, "status": "SCRAPING COMPLETE"}
             )
-            yield sse(
+            emit(
                 {
                     "type": "log",
                     "message": f"Scraped {len(all_posts)} total posts",
@@ -391,20 +544,36 @@ def api_run_agent(focus_area: str):
             )
 
             # Step 2: Analysis with batching
-            from analyzer import analyze_batch, merge_batch_analyses
+            from analyzer import (
+                analyze_batch_with_split,
+                build_report,
+                filter_analyzed_posts,
+                merge_batch_analyses,
+                record_analyzed_posts,
+            )
 
-            yield sse({"type": "progress", "step": 2, "percent": 0, "status": "ANALYZING WITH LLM"})
+            emit({"type": "progress", "step": 2, "percent": 0, "status": "ANALYZING WITH LLM"})
 
-            total_posts = len(all_posts)
-            batch_size = 50
+            # Posts analyzed in earlier scans are already in the merged report
+            posts, cached_posts = filter_analyzed_posts(all_posts, focus_area)
+            if cached_posts:
+                emit(
+                    {
+                        "type": "log",
+                        "message": f"Skipping {cached_posts} posts already analyzed in earlier scans",
+                    }
+                )
+
+            total_posts = len(posts)
+            batch_size = config.get("llm", {}).get("batch_size", 50)
             mode = scrape_data.get("mode", "opportunities")
 
             if total_posts > batch_size:
                 # Batched analysis with streaming progress
-                batches = [all_posts[i : i + batch_size] for i in range(0, total_posts, batch_size)]
+                batches = [posts[i : i + batch_size] for i in range(0, total_posts, batch_size)]
                 num_batches = len(batches)
 
-                yield sse(
+                emit(
                     {
                         "type": "log",
                         "message": f"Large dataset ({total_posts} posts) - analyzing in {num_batches} batches",
@@ -413,9 +582,11 @@ def api_run_agent(focus_area: str):
                 )
 
                 batch_analyses = []
+                # Only posts whose batch (or split half) parsed are remembered as analyzed
+                analyzed = []
                 for i, batch in enumerate(batches, 1):
                     pct = int((i - 1) / num_batches * 100)
-                    yield sse(
+                    emit(
                         {
                             "type": "progress",
                             "step": 2,
@@ -423,18 +594,20 @@ def api_run_agent(focus_area: str):
                             "status": f"BATCH {i}/{num_batches}",
                         }
                     )
-                    yield sse(
+                    emit(
                         {
                             "type": "log",
                             "message": f"Analyzing batch {i}/{num_batches} ({len(batch)} posts)...",
                         }
                     )
 
-                    batch_result = analyze_batch(batch, scrape_data, config, i, num_batches)
+                    batch_result = analyze_batch_with_split(
+                        batch, scrape_data, config, i, num_batches, analyzed
+                    )
 
                     if "error" not in batch_result:
                         batch_analyses.append(batch_result)
-                        yield sse(
+                        emit(
                             {
                                 "type": "log",
                                 "message": f"  Batch {i} complete",
@@ -442,7 +615,7 @@ def api_run_agent(focus_area: str):
                             }
                         )
                     else:
-                        yield sse(
+                        emit(
                             {
                                 "type": "log",
                                 "message": f"  Batch {i} error: {batch_result.get('error', 'unknown')[:100]}",
@@ -452,7 +625,7 @@ def api_run_agent(focus_area: str):
 
                 # Merge results
                 if batch_analyses:
-                    yield sse(
+                    emit(
                         {
                             "type": "log",
                             "message": f"Merging {len(batch_analyses)} batch results...",
@@ -466,26 +639,22 @@ def api_run_agent(focus_area: str):
                         "pain_points": [],
                     }
 
-                # Build the report
-                report = {
-                    "id": f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                    "focus_area": scrape_data["focus_area"],
-                    "focus_name": scrape_data["focus_name"],
-                    "generated_at": datetime.now().isoformat(),
-                    "data_scraped_at": scrape_data["scraped_at"],
-                    "subreddits_analyzed": scrape_data["subreddits"],
-                    "posts_analyzed": total_posts,
-                    "analysis": analysis,
-                    "metadata": {
-                        "model": config.get("llm", {}).get("model", "unknown"),
-                        "source_file": scrape_data.get("source_file", "unknown"),
-                        "batches_used": num_batches,
-                    },
-                }
+                if analyzed:
+                    record_analyzed_posts(analyzed, focus_area)
+                flush_usage()
+
+                report = build_report(
+                    scrape_data,
+                    analysis,
+                    config,
+                    num_batches,
+                    cached_posts,
+                    total_posts - len(analyzed),
+                )
             else:
-                # Small dataset - single analysis
+                # Small dataset - single analysis (skips analyzed posts itself)
                 model_name = config.get("llm", {}).get("model", "LLM")
-                yield sse(
+                emit(
                     {
                         "type": "log",
                         "message": f"Sending to {model_name} for analysis...",
@@ -494,22 +663,17 @@ def api_run_agent(focus_area: str):
                 )
                 report = analyze_scrape_data(scrape_data, config)
 
-            report_path, new_opps, new_pains = save_report(report)
-
-            # Reload the merged report
-            with open(report_path) as f:
-                report = json.load(f)
+            # The merged report as saved, not just this scan's findings
+            report, _, new_opps, new_pains = save_report(report)
 
-            # Get token usage
-            usage_file = DATA_DIR / "usage.json"
+            # Get token usage from the small totals file, not the full usage log
+            totals_file = DATA_DIR / "usage_totals.json"
             tokens = 0
-            if usage_file.exists():
-                with open(usage_file) as f:
-                    usage_data = json.load(f)
-                tokens = usage_data.get("totals", {}).get("total_tokens", 0)
+            if totals_file.exists():
+                tokens = jsonio.load_file(totals_file).get("total_tokens", 0)
 
-            yield sse({"type": "stats", "tokens": tokens})
-            yield sse(
+            emit({"type": "stats", "tokens": tokens})
+            emit(
                 {"type": "progress", "step": 2, "percent": 100, "status": "ANALYSIS COMPLETE"}
             )
 
@@ -523,9 +687,9 @@ def api_run_agent(focus_area: str):
                 total_stories = len(analysis.get("top_stories", []))
                 total_releases = len(analysis.get("notable_releases", []))
 
-                yield sse({"type": "stats", "opportunities": total_stories})  # Reuse field for UI
+                emit({"type": "stats", "opportunities": total_stories})  # Reuse field for UI
 
-                yield sse(
+                emit(
                     {
                         "type": "log",
                         "message": f"Found {total_stories} stories, {total_releases} releases",
@@ -534,9 +698,9 @@ def api_run_agent(focus_area: str):
                 )
 
                 # Step 3: Complete
-                yield sse({"type": "progress", "step": 3, "percent": 100, "status": "COMPLETE"})
+                emit({"type": "progress", "step": 3, "percent": 100, "status": "COMPLETE"})
                 report_id = report.get("id", "unknown")
-                yield sse(
+                emit(
                     {
                         "type": "complete",
                         "report_id": report_id,
@@ -552,18 +716,18 @@ def api_run_agent(focus_area: str):
                 total_opps = len(analysis.get("opportunities", []))
                 total_pains = len(analysis.get("pain_points", []))
 
-                yield sse({"type": "stats", "opportunities": total_opps})
+                emit({"type": "stats", "opportunities": total_opps})
 
                 # Show what's new vs total
                 if new_opps > 0 or new_pains > 0:
-                    yield sse(
+                    emit(
                         {
                             "type": "log",
                             "message": f"Added {new_opps} new opportunities, {new_pains} new pain points",
                             "level": "success",
                         }
                     )
-                yield sse(
+                emit(
                     {
                         "type": "log",
                         "message": f"Total: {total_opps} opportunities, {total_pains} pain points",
@@ -572,9 +736,9 @@ def api_run_agent(focus_area: str):
                 )
 
                 # Step 3: Complete
-                yield sse({"type": "progress", "step": 3, "percent": 100, "status": "COMPLETE"})
+                emit({"type": "progress", "step": 3, "percent": 100, "status": "COMPLETE"})
                 report_id = report.get("id", "unknown")
-                yield sse(
+                emit(
                     {
                         "type": "complete",
                         "report_id": report_id,
@@ -588,20 +752,47 @@ def api_run_agent(focus_area: str):
                 )
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            emit({"type": "error", "message": str(e)})
             import traceback
 
             traceback.print_exc()
 
-    return Response(generate(), mimetype="text/event-stream")
+    def generate():
+        # The pipeline runs on its own thread and only hands events over, so a
+        # slow or vanished client never stalls the scan (and it still saves)
+        events = queue.Queue()
+        done = object()
+
+        def worker():
+            try:
+                run_pipeline(events.put)
+            finally:
+                events.put(done)
+
+        threading.Thread(target=worker, name=f"scan-{focus_area}", daemon=True).start()
+        while (event := events.get()) is not done:
+            yield sse(event)
+
+    # Events are already bytes; let Werkzeug pass them straight through
+    return Response(generate(), mimetype="text/event-stream", direct_passthrough=True)
 
 
 if __name__ == "__main__":
     config = load_config()
     web_config = config.get("web", {})
 
+    # Show analyzer progress in the server console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Ensure directories exist
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    app.run(host=web_config.get("host", "0.0.0.0"), port=web_config.get("port", 8501), debug=True)
+    # Threaded so a running scan's SSE stream doesn't block the rest of the
+    # dashboard; the debugger and reloader are opt-in via FLASK_DEBUG=1
+    app.run(
+        host=web_config.get("host", "0.0.0.0"),
+        port=web_config.get("port", 8501),
+        debug=os.environ.get("FLASK_DEBUG") == "1",
+        threaded=True,
+    )
@@ -0,0 +1,11 @@
+"""WSGI entry point for serving the dashboard with a production server.
+
+    gunicorn --chdir web -k gthread -w 2 --threads 8 --timeout 300 wsgi:application
+
+gthread workers keep long-running scan streams (/api/run/...) from blocking
+other requests; the timeout covers a full scrape and analysis.
+"""
+
+from app import app as application
+
+__all__ = ["application"]